@@ -1,40 +1,13 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from itertools import combinations
+import os
+import sys
 
-class AttrComparator:
-    """
-    A class used to order sets of attributes.
-    """
-
-    def compare_attrs_lt(set1: set, set2: set):
-        """
-        Compares two attribute sets and checks if
-        set1 < set2 or not.
-        """
-        set1, set2 = sorted(set1), sorted(set2)
-        if set1 == set2:
-            return False
-
-        if len(set1) > len(set2):
-            return False
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-        # If one set is smaller than the other using the
-        # native __lt__ method for sets, or the length
-        # of one set is smaller than the other.
-        if set1 < set2 or len(set1) < len(set2):
-            return True
+from common import dependency
 
-        for i in range(0, len(set1)):
-            # If an attribute is lexographically smaller,
-            # return True.
-            if set1[i] < set2[i]:
-                return True
-
-            if set1[i] > set2[i]:
-                return False
-
-        return False
-
-class FDep:
+class FDep(dependency.FDep):
     """
     A class used to represent a functional dependency.
 
@@ -42,55 +15,13 @@ class FDep:
 
     Attributes
     ----------
-    lhs : set
+    lhs : frozenset
         The set of left-hand side attributes
-    rhs : set
+    rhs : frozenset
         The set of right-hand side attributes
     """
 
-    def __init__(self, lhs, rhs):
-        self.lhs = set(lhs)
-        self.rhs = set(rhs)
-
-    def __repr__(self):
-        return str(self.to_result())
-
-    def __hash__(self):
-        """
-        Uses the hash values of the LHS and RHS attributes
-        to return a new hash value.
-        """
-        return hash(hash(tuple(self.lhs)) * hash(tuple(self.rhs)))
-
-    def __eq__(self, other):
-        """
-        Checks if the FDep is equal to another FDep or not.
-        """
-        if not isinstance(other, FDep):
-            return False
-
-        return self.lhs == other.lhs and self.rhs == other.rhs
-
-    def __lt__(self, other):
-        # Returns true if self.lhs < other.lhs OR
-        # (self.lhs == other.lhs AND self.rhs < other.rhs)
-        return AttrComparator.compare_attrs_lt(self.lhs, other.lhs) or (
-            sorted(self.lhs) == sorted(other.lhs)
-            and AttrComparator.compare_attrs_lt(self.rhs, other.rhs)
-        )
-
-    def to_result(self):
-        """
-        Returns the FDep as the form of [LHS, RHS]
-        as required by the assignment.
-        """
-        return "{} -> {}".format(''.join(sorted(self.lhs)), ''.join(sorted(self.rhs)))
-
-    def is_trivial(self):
-        """
-        Checks if the FDep is trivial or not.
-        """
-        return self.lhs == self.rhs or (self.rhs).issubset(self.lhs)
+    __slots__ = ()
 
 class AttributeClosure(FDep):
     """
@@ -99,6 +30,8 @@ class AttributeClosure(FDep):
     Represented in the form of { attributes -> closure }
     """
 
+    __slots__ = ()
+
     def attributes(self):
         return self.lhs
 
@@ -114,8 +47,10 @@ class AttributeClosure(FDep):
 
         return self.lhs == other.lhs and self.rhs == other.rhs
 
+    __hash__ = FDep.__hash__
+
 
-class MVDep:
+class MVDep(dependency.MVDep):
     """
     A class used to represent a mutli-valued dependency.
 
@@ -123,50 +58,13 @@ class MVDep:
 
     Attributes
     ----------
-    lhs : set
+    lhs : frozenset
         The set of left-hand side attributes
-    rhs : set
+    rhs : frozenset
         The set of right-hand side attributes
     """
 
-    def __init__(self, lhs, rhs):
-        self.lhs = set(lhs)
-        self.rhs = set(rhs)
-
-    def __repr__(self):
-        return str(self.to_result())
-
-    def __hash__(self):
-        """
-        Uses the hash values of the LHS and RHS attributes
-        to return a new hash value.
-        """
-        return hash(hash(tuple(self.lhs)) * hash(tuple(self.rhs)))
-
-    def __eq__(self, other):
-        """
-        Checks if the FDep is equal to another FDep or not.
-        """
-        if not isinstance(other, FDep):
-            return False
-
-        return self.lhs == other.lhs and self.rhs == other.rhs
-
-    def __lt__(self, other):
-        # Returns true if self.lhs < other.lhs OR
-        # (self.lhs == other.lhs AND self.rhs < other.rhs)
-        return AttrComparator.compare_attrs_lt(self.lhs, other.lhs) or (
-            sorted(self.lhs) == sorted(other.lhs)
-            and AttrComparator.compare_attrs_lt(self.rhs, other.rhs)
-        )
-
-    def to_result(self):
-        """
-        Returns the FDep as the form of [LHS, RHS]
-        as required by the assignment.
-        """
-        return "{} ->> {}".format(''.join(sorted(self.lhs)), ''.join(sorted(self.rhs)))
-
+    __slots__ = ()
 
 class Schema: 
     """
@@ -181,6 +79,13 @@ class Schema:
         The list of rules.
     """
 
+    # The fewest attributes for which the decomposition is split across processes.
+    PARALLEL_MIN_ATTRS = 12
+
+    # The depth of the decomposition from which each subtree
+    # is decomposed serially by one process.
+    PARALLEL_MAX_DEPTH = 3
+
     def __init__(self, attributes='', fds=[], mvds=[]):
         self.attributes = set(attributes)
         self.fds = fds
@@ -340,9 +245,13 @@ class Schema:
         
         return True 
 
-    def get_4nf_decomposition(self):
+    def _split_4nf(self):
+        """
+        Returns the two schemas a schema is split into on its first
+        MVD which violates 4NF, or None if it is in 4NF.
+        """
         if self.is_in_4nf():
-            return [self]
+            return None
 
         superkeys = self.get_superkeys()
 
@@ -352,9 +261,82 @@ class Schema:
                 not sorted(mvd.lhs) in superkeys:
                 r1 = mvd.lhs.union(mvd.rhs)
                 r2 = self.attributes.difference(mvd.rhs.difference(mvd.lhs))
-                R1 = self.init_child_schema(r1)
-                R2 = self.init_child_schema(r2)
+                return self.init_child_schema(r1), self.init_child_schema(r2)
+
+        return None
+
+    def get_4nf_decomposition(self, workers: int = 1):
+        """
+        Returns a list of schemas which are in 4NF. If workers is
+        more than one and there are enough attributes, sibling
+        schemas are decomposed at the same time.
+        """
+        if workers > 1 and len(self.attributes) >= self.PARALLEL_MIN_ATTRS:
+            return self._decompose_4nf_in_pool(workers)
+
+        split = self._split_4nf()
+        if split is None:
+            return [self]
 
-                return R1.get_4nf_decomposition() + R2.get_4nf_decomposition()
+        R1, R2 = split
+        return R1.get_4nf_decomposition() + R2.get_4nf_decomposition()
 
+    def _decompose_4nf_step(self, is_serial: bool):
+        """
+        Returns the two schemas a schema is split into, or a list
+        of the final schemas. If is_serial is true, the schema is
+        decomposed all the way down.
+        """
+        if is_serial:
+            return self.get_4nf_decomposition()
+
+        split = self._split_4nf()
+        if split is None:
+            return [self]
 
+        return split
+
+    def _decompose_4nf_in_pool(self, workers: int) -> list:
+        """
+        Returns the decomposition into 4NF, splitting the schemas
+        of each step across a pool of processes, so sibling
+        subtrees are decomposed at the same time.
+        """
+        # The result of each node of the decomposition tree, either the
+        # nodes of its two schemas or its final schemas.
+        results = {}
+        num_nodes = 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(_decompose_4nf_chunk, self, False): (0, 0)}
+            while len(pending) > 0:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, depth = pending.pop(future)
+                    result = future.result()
+                    if isinstance(result, list):
+                        results[node] = result
+                        continue
+
+                    children = (num_nodes, num_nodes + 1)
+                    num_nodes += 2
+                    results[node] = children
+                    for child, schema in zip(children, result):
+                        is_serial = depth + 1 >= self.PARALLEL_MAX_DEPTH
+                        future = executor.submit(_decompose_4nf_chunk, schema, is_serial)
+                        pending[future] = (child, depth + 1)
+
+        # Read the final schemas off the tree from left to right.
+        decomposition = []
+        nodes = [0]
+        while len(nodes) > 0:
+            result = results[nodes.pop()]
+            if isinstance(result, list):
+                decomposition.extend(result)
+            else:
+                nodes.extend(reversed(result))
+
+        return decomposition
+
+
+def _decompose_4nf_chunk(schema: Schema, is_serial: bool):
+    return schema._decompose_4nf_step(is_serial)
@@ -1,10 +1,17 @@
+import os
 import sys
+
 from deps import FDep, MVDep, Schema
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.options import get_jobs
+
 class FDUtils:
-    def __init__(self, fd_filename: str):
+    def __init__(self, fd_filename: str, jobs: int = 1):
         self.f = Schema()
         self.fd_filename = fd_filename
+        self.jobs = jobs
 
     def init(self):
         self.populate_fds()
@@ -12,7 +19,7 @@ class FDUtils:
         print(self.f.is_in_4nf())
 
         print("\nDecomposition: ")
-        for f in self.f.get_4nf_decomposition():
+        for f in self.f.get_4nf_decomposition(self.jobs):
             print(f)
             print()
 
@@ -50,12 +57,19 @@ class FDUtils:
 
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <fd_file>")
+    args = sys.argv[1:]
+    try:
+        jobs = get_jobs(args)
+    except (IndexError, ValueError):
+        args = []
+
+    if len(args) != 1:
+        print("Usage: python main.py [--jobs N] <fd_file>")
         return
 
-    utils = FDUtils(sys.argv[1])
+    utils = FDUtils(args[0], jobs)
     utils.init()
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,13 @@
 from ast import Attribute
+import os
+import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-class AttrComparator:
-    """
-    A class used to order sets of attributes.
-    """
-
-    def compare_attrs_lt(set1: set, set2: set):
-        """
-        Compares two attribute sets and checks if
-        set1 < set2 or not.
-        """
-        set1, set2 = sorted(set1), sorted(set2)
-        if set1 == set2:
-            return False
-
-        if len(set1) > len(set2):
-            return False
-
-        # If one set is smaller than the other using the
-        # native __lt__ method for sets, or the length
-        # of one set is smaller than the other.
-        if set1 < set2 or len(set1) < len(set2):
-            return True
-
-        for i in range(0, len(set1)):
-            # If an attribute is lexographically smaller,
-            # return True.
-            if set1[i] < set2[i]:
-                return True
+from common import dependency
 
-            if set1[i] > set2[i]:
-                return False
-
-        return False
 
-class FDep:
+class FDep(dependency.FDep):
     """
     A class used to represent a functional dependency.
 
@@ -43,54 +15,15 @@ class FDep:
 
     Attributes
     ----------
-    lhs : set
+    lhs : frozenset
         The set of left-hand side attributes
-    rhs : set
+    rhs : frozenset
         The set of right-hand side attributes
     """
 
-    def __init__(self, lhs, rhs):
-        self.lhs = set(lhs)
-        self.rhs = set(rhs)
-
-    def __repr__(self):
-        return str(self.to_result())
-
-    def __hash__(self):
-        """
-        Uses the hash values of the LHS and RHS attributes
-        to return a new hash value.
-        """
-        return hash(hash(tuple(self.lhs)) * hash(tuple(self.rhs)))
-
-    def __eq__(self, other):
-        """
-        Checks if the FDep is equal to another FDep or not.
-        """
-        if not isinstance(other, FDep):
-            return False
-
-        return self.lhs == other.lhs and self.rhs == other.rhs
-
-    def __lt__(self, other):
-        # Returns true if self.lhs < other.lhs OR
-        # (self.lhs == other.lhs AND self.rhs < other.rhs)
-        return AttrComparator.compare_attrs_lt(self.lhs, other.lhs) or (
-            sorted(self.lhs) == sorted(other.lhs)
-            and AttrComparator.compare_attrs_lt(self.rhs, other.rhs)
-        )
-
-    def copy(self):
-        return FDep(self.lhs.copy(), self.rhs.copy())
-
-    def to_result(self):
-        """
-        Returns the FDep as the form of [LHS, RHS]
-        as required by the assignment.
-        """
-        return "{} -> {}".format(''.join(sorted(self.lhs)), ''.join(sorted(self.rhs)))
+    __slots__ = ()
 
-class MVDep:
+class MVDep(dependency.MVDep):
     """
     A class used to represent a mutli-valued dependency.
 
@@ -98,52 +31,13 @@ class MVDep:
 
     Attributes
     ----------
-    lhs : set
+    lhs : frozenset
         The set of left-hand side attributes
-    rhs : set
+    rhs : frozenset
         The set of right-hand side attributes
     """
 
-    def __init__(self, lhs, rhs):
-        self.lhs = set(lhs)
-        self.rhs = set(rhs)
-
-    def __repr__(self):
-        return str(self.to_result())
-
-    def __hash__(self):
-        """
-        Uses the hash values of the LHS and RHS attributes
-        to return a new hash value.
-        """
-        return hash(hash(tuple(self.lhs)) * hash(tuple(self.rhs)))
-
-    def __eq__(self, other):
-        """
-        Checks if the FDep is equal to another FDep or not.
-        """
-        if not isinstance(other, FDep):
-            return False
-
-        return self.lhs == other.lhs and self.rhs == other.rhs
-
-    def __lt__(self, other):
-        # Returns true if self.lhs < other.lhs OR
-        # (self.lhs == other.lhs AND self.rhs < other.rhs)
-        return AttrComparator.compare_attrs_lt(self.lhs, other.lhs) or (
-            sorted(self.lhs) == sorted(other.lhs)
-            and AttrComparator.compare_attrs_lt(self.rhs, other.rhs)
-        )
-
-    def copy(self):
-        return MVDep(self.lhs.copy(), self.rhs.copy())
-
-    def to_result(self):
-        """
-        Returns the FDep as the form of [LHS, RHS]
-        as required by the assignment.
-        """
-        return "{} ->> {}".format(''.join(sorted(self.lhs)), ''.join(sorted(self.rhs)))
+    __slots__ = ()
 
 class Tuple:
     """
@@ -347,7 +241,7 @@ class Schema:
 
     def chase(self):
         self.print_schema()
-        print("{}: {}".format(type(self.target), self.target.lhs))
+        print("{}: {}".format(type(self.target), set(self.target.lhs)))
         for attr in self.target.lhs:
             for tuple in self.tuples: 
                 tuple.set_val(attr, '1')
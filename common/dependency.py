@@ -0,0 +1,121 @@
+class AttrComparator:
+    """
+    A class used to order sets of attributes.
+    """
+
+    def compare_attrs_lt(set1: set, set2: set):
+        """
+        Compares two attribute sets and checks if
+        set1 < set2 or not.
+        """
+        return AttrComparator.sort_key(set1) < AttrComparator.sort_key(set2)
+
+    def sort_key(attrs) -> tuple:
+        """
+        Returns the key which orders attribute sets: smaller
+        sets first, then sets with lexicographically smaller
+        sorted attributes.
+        """
+        return (len(attrs), tuple(sorted(attrs)))
+
+
+class Dependency:
+    """
+    A class used to represent an immutable dependency
+    between two sets of attributes.
+
+    ...
+
+    Attributes
+    ----------
+    lhs : frozenset
+        The set of left-hand side attributes
+    rhs : frozenset
+        The set of right-hand side attributes
+    """
+
+    __slots__ = ("lhs", "rhs", "key", "_hash")
+
+    # The arrow printed between the LHS and the RHS.
+    ARROW = "->"
+
+    def __init__(self, lhs, rhs):
+        lhs, rhs = frozenset(lhs), frozenset(rhs)
+        object.__setattr__(self, "lhs", lhs)
+        object.__setattr__(self, "rhs", rhs)
+
+        # The key orders dependencies by their LHS, then by their RHS,
+        # and is computed once instead of on every comparison.
+        key = AttrComparator.sort_key(lhs) + AttrComparator.sort_key(rhs)
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "_hash", hash((self.ARROW, lhs, rhs)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def __reduce__(self):
+        return (type(self), (self.lhs, self.rhs))
+
+    def __repr__(self):
+        return str(self.to_result())
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        """
+        Checks if the dependency is equal to another dependency or not.
+        """
+        if not isinstance(other, Dependency):
+            return False
+
+        return (
+            self._hash == other._hash
+            and self.ARROW == other.ARROW
+            and self.lhs == other.lhs
+            and self.rhs == other.rhs
+        )
+
+    def __lt__(self, other):
+        # Returns true if self.lhs < other.lhs OR
+        # (self.lhs == other.lhs AND self.rhs < other.rhs)
+        return self.key < other.key
+
+    def copy(self):
+        # The dependency is immutable, so it can be shared.
+        return self
+
+    def to_result(self):
+        """
+        Returns the dependency as the form of LHS -> RHS.
+        """
+        return "{} {} {}".format(
+            "".join(sorted(self.lhs)), self.ARROW, "".join(sorted(self.rhs))
+        )
+
+    def is_trivial(self):
+        """
+        Checks if the dependency is trivial or not.
+        """
+        return self.rhs <= self.lhs
+
+
+class FDep(Dependency):
+    """
+    A class used to represent a functional dependency.
+    """
+
+    __slots__ = ()
+
+
+class MVDep(Dependency):
+    """
+    A class used to represent a mutli-valued dependency.
+    """
+
+    __slots__ = ()
+
+    ARROW = "->>"
@@ -0,0 +1,21 @@
+def pop_option(args: list, option: str):
+    """
+    Removes an option and its value from the arguments,
+    returning the value, or None if it is not given.
+    """
+    if option not in args:
+        return None
+
+    i = args.index(option)
+    value = args[i + 1]
+    del args[i : i + 2]
+    return value
+
+
+def get_jobs(args: list) -> int:
+    """
+    Removes the --jobs option from the arguments, returning
+    the number of processes it asks for.
+    """
+    jobs = pop_option(args, "--jobs")
+    return 1 if jobs is None else int(jobs)
@@ -1,101 +1,599 @@
-from itertools import combinations
-from random import random
-from math import ceil
+from array import array
+from collections import OrderedDict, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations, islice, repeat
 
+import json
+import os
 import sys
 
-class AttrComparator:
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import dependency
+
+class FDep(dependency.FDep):
     """
-    A class used to order sets of attributes.
+    A class used to represent a functional dependency.
+
+    ...
+
+    Attributes
+    ----------
+    lhs : frozenset
+        The set of left-hand side attributes
+    rhs : frozenset
+        The set of right-hand side attributes
     """
 
-    def compare_attrs_lt(set1: set, set2: set):
+    __slots__ = ()
+
+    def to_result(self):
         """
-        Compares two attribute sets and checks if
-        set1 < set2 or not.
+        Returns the FDep as the form of [LHS, RHS]
+        as required by the assignment.
         """
-        set1, set2 = sorted(set1), sorted(set2)
-        if set1 == set2:
-            return False
+        return [sorted(self.lhs), sorted(self.rhs)]
 
-        if len(set1) > len(set2):
-            return False
 
-        # If one set is smaller than the other using the
-        # native __lt__ method for sets, or the length
-        # of one set is smaller than the other.
-        if set1 < set2 or len(set1) < len(set2):
-            return True
+class AttrEncoder:
+    """
+    A class used to intern attributes as bit positions, so that
+    sets of attributes can be represented as integer masks.
 
-        for i in range(0, len(set1)):
-            # If an attribute is lexographically smaller,
-            # return True.
-            if set1[i] < set2[i]:
-                return True
+    The attributes of the schema are interned in sorted order,
+    so they occupy the lowest bits of every mask.
+    """
 
-            if set1[i] > set2[i]:
-                return False
+    def __init__(self, attributes=[]):
+        self.attrs = []
+        self.bits = {}
+        self.is_ordered = True
+
+        for attr in sorted(attributes):
+            self.intern(attr)
+
+    def intern(self, attr) -> int:
+        """
+        Returns the bit of an attribute, assigning a new
+        bit to the attribute if it has not been seen before.
+        """
+        bit = self.bits.get(attr)
+        if bit is None:
+            if len(self.attrs) > 0 and attr < self.attrs[-1]:
+                self.is_ordered = False
+
+            bit = 1 << len(self.attrs)
+            self.bits[attr] = bit
+            self.attrs.append(attr)
+
+        return bit
+
+    def encode(self, attrs) -> int:
+        """
+        Returns the mask of a set of attributes.
+        """
+        mask = 0
+        for attr in attrs:
+            mask |= self.intern(attr)
+
+        return mask
 
-        return False
+    def to_list(self, mask: int) -> list:
+        """
+        Returns the sorted list of attributes of a mask.
+        """
+        attrs = []
+        while mask:
+            bit = mask & -mask
+            attrs.append(self.attrs[bit.bit_length() - 1])
+            mask ^= bit
+
+        return attrs if self.is_ordered else sorted(attrs)
+
+    def decode(self, mask: int) -> set:
+        """
+        Returns the set of attributes of a mask.
+        """
+        return set(self.to_list(mask))
+
+    def submasks(mask: int):
+        """
+        Yields every subset of a mask, including the
+        empty set and the mask itself.
+        """
+        submask = mask
+        while True:
+            yield submask
+            if submask == 0:
+                return
+            submask = (submask - 1) & mask
+
+    def bits_descending(mask: int) -> list:
+        """
+        Returns the bits of a mask from the highest to the lowest.
+        """
+        bits = []
+        while mask:
+            bit = 1 << (mask.bit_length() - 1)
+            bits.append(bit)
+            mask ^= bit
+
+        return bits
+
+    def split_chunks(mask: int, num_workers: int):
+        """
+        Splits the subsets of a mask into a few chunks per worker by
+        fixing its last attributes, returning the mask of the free
+        attributes and the fixed attributes of each chunk.
+
+        The chunks are in the order of their fixed attributes, so if
+        the mask is contiguous, each chunk covers a contiguous range
+        of masks and the chunks can be joined back in order.
+        """
+        num_fixed = min(bin(mask).count("1"), (4 * num_workers - 1).bit_length())
+        fixed_bits = AttrEncoder.bits_descending(mask)[:num_fixed][::-1]
+        bases = [
+            sum(bit for i, bit in enumerate(fixed_bits) if chunk >> i & 1)
+            for chunk in range(1 << num_fixed)
+        ]
+
+        return mask & ~sum(fixed_bits), bases
+
+    def sort_key(self, mask: int):
+        """
+        Returns a key which orders masks the same way
+        AttrComparator orders their sets of attributes.
+        """
+        return (bin(mask).count("1"), self.to_list(mask))
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+Classification = namedtuple(
+    "Classification", ["normal_form", "candidate_keys", "prime_attributes", "violations"]
+)
 
+AttributeClasses = namedtuple(
+    "AttributeClasses", ["lhs_only", "rhs_only", "both", "neither"]
+)
 
-class FDep:
+
+class ClosureCache:
     """
-    A class used to represent a functional dependency.
+    A class used to memoize attribute closures, keyed by the
+    mask of the attributes whose closure was computed.
 
-    ...
+    If maxsize is given, the least recently used closures are
+    evicted once the cache holds more than maxsize closures.
+    """
 
-    Attributes
-    ----------
-    lhs : set
-        The set of left-hand side attributes
-    rhs : set
-        The set of right-hand side attributes
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.closures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, mask: int):
+        """
+        Returns the cached closure of a mask, or None if
+        the closure has not been cached.
+        """
+        closure = self.closures.get(mask)
+        if closure is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.maxsize is not None:
+            self.closures.move_to_end(mask)
+
+        return closure
+
+    def put(self, mask: int, closure: int) -> None:
+        """
+        Caches the closure of a mask.
+        """
+        if self.maxsize == 0:
+            return
+
+        self.closures[mask] = closure
+        if self.maxsize is not None and len(self.closures) > self.maxsize:
+            self.closures.popitem(last=False)
+
+    def count(self, hits: int = 0, misses: int = 0) -> None:
+        """
+        Counts closures which were reused or computed outside of
+        the cache, in the lattice or in a walk of subsets.
+        """
+        self.hits += hits
+        self.misses += misses
+
+    def clear(self) -> None:
+        """
+        Discards all cached closures, keeping the hit and miss counts.
+        """
+        self.closures.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.closures))
+
+
+class MemoizedIterator:
+    """
+    A class used to share one iterator between several consumers,
+    keeping the items it has produced so far so each consumer can
+    read them again without the iterator being advanced further
+    than the furthest consumer has read.
+    """
+
+    def __init__(self, iterable):
+        self.iterator = iter(iterable)
+        self.items = []
+
+    def __iter__(self):
+        i = 0
+        while True:
+            if i == len(self.items):
+                try:
+                    self.items.append(next(self.iterator))
+                except StopIteration:
+                    return
+
+            yield self.items[i]
+            i += 1
+
+
+class ClosureEngine:
+    """
+    A class used to compute attribute closures over FDs whose
+    LHS and RHS are encoded as masks.
+
+    It only holds plain lists and dicts of ints, so that it can be
+    rebuilt cheaply in worker processes from the FDep masks alone.
     """
 
-    def __init__(self, lhs, rhs):
-        self.lhs = set(lhs)
-        self.rhs = set(rhs)
+    def __init__(self, fd_masks: list):
+        self.fd_masks = fd_masks
+        self.num_bits = 0
+        self.kernel = None
 
-    def __repr__(self):
-        return str(self.to_result())
+        # Index every FDep by each attribute of its LHS, so that
+        # a closure only visits the FDs of the attributes it adds.
+        self.lhs_counts = []
+        self.lhs_index = {}
+        for i, (lhs, rhs) in enumerate(fd_masks):
+            self.num_bits = max(self.num_bits, lhs.bit_length(), rhs.bit_length())
+            self.lhs_counts.append(bin(lhs).count("1"))
+            while lhs:
+                bit = lhs & -lhs
+                self.lhs_index.setdefault(bit, []).append(i)
+                lhs ^= bit
 
-    def __hash__(self):
+    def get_kernel(self):
         """
-        Uses the hash values of the LHS and RHS attributes
-        to return a new hash value.
+        Returns the NumPy closure kernel of the FDs, or None
+        if the kernel cannot be used.
         """
-        return hash(hash(tuple(self.lhs)) * hash(tuple(self.rhs)))
+        if self.kernel is None and ClosureKernel.is_supported(self.num_bits):
+            self.kernel = ClosureKernel(self.fd_masks)
 
-    def __eq__(self, other):
+        return self.kernel
+
+    def compute(self, mask: int) -> int:
         """
-        Checks if the FDep is equal to another FDep or not.
+        Computes the attribute closure of a mask of attributes.
+
+        Uses the LINCLOSURE algorithm: every FDep keeps a count of
+        the LHS attributes missing from the closure, and fires once
+        when that count drops to zero.
         """
-        if not isinstance(other, FDep):
-            return False
+        fd_masks, lhs_index = self.fd_masks, self.lhs_index
+        missing = self.lhs_counts.copy()
+        closure = pending = mask
 
-        return self.lhs == other.lhs and self.rhs == other.rhs
+        while pending:  # While there are attributes left to process.
+            bit = pending & -pending
+            pending ^= bit
 
-    def __lt__(self, other):
-        # Returns true if self.lhs < other.lhs OR
-        # (self.lhs == other.lhs AND self.rhs < other.rhs)
-        return AttrComparator.compare_attrs_lt(self.lhs, other.lhs) or (
-            sorted(self.lhs) == sorted(other.lhs)
-            and AttrComparator.compare_attrs_lt(self.rhs, other.rhs)
-        )
+            for i in lhs_index.get(bit, ()):
+                missing[i] -= 1
+                if missing[i] == 0:
+                    new_attrs = fd_masks[i][1] & ~closure
+                    closure |= new_attrs
+                    pending |= new_attrs
 
-    def to_result(self):
+        return closure
+
+    def disable(self, i: int) -> None:
         """
-        Returns the FDep as the form of [LHS, RHS]
-        as required by the assignment.
+        Stops an FDep from firing in later closures,
+        as if it had been removed from the FDs.
         """
-        return [sorted(self.lhs), sorted(self.rhs)]
+        # The count of a disabled FDep never drops to zero.
+        self.lhs_counts[i] = -1
+
+    def enable(self, i: int) -> None:
+        """
+        Lets a disabled FDep fire again.
+        """
+        self.lhs_counts[i] = bin(self.fd_masks[i][0]).count("1")
+
+    def is_redundant(self, i: int) -> bool:
+        """
+        Checks if an FDep is implied by the other enabled FDs.
+        """
+        lhs, rhs = self.fd_masks[i]
+        count = self.lhs_counts[i]
+        self.lhs_counts[i] = -1
+        closure = self.compute(lhs)
+        self.lhs_counts[i] = count
+
+        return rhs & ~closure == 0
+
+    def extend(self, closure: int, mask: int) -> int:
+        """
+        Extends a closed mask of attributes with more attributes,
+        returning the closure of their union.
+
+        Only the FDs indexed by the newly added attributes can fire.
+        """
+        fd_masks, lhs_index, lhs_counts = self.fd_masks, self.lhs_index, self.lhs_counts
+        pending = mask & ~closure
+        closure |= pending
+
+        while pending:  # While there are attributes left to process.
+            bit = pending & -pending
+            pending ^= bit
+
+            for i in lhs_index.get(bit, ()):
+                lhs, rhs = fd_masks[i]
+                if lhs & ~closure == 0 and rhs & ~closure != 0 and lhs_counts[i] >= 0:
+                    new_attrs = rhs & ~closure
+                    closure |= new_attrs
+                    pending |= new_attrs
+
+        return closure
+
+    def walk(self, attrs: int, base: int = 0, closure=None):
+        """
+        Yields every subset of attrs joined with base, together with
+        its closure, visiting the subsets in Gray code order.
+
+        Consecutive subsets differ by one attribute. The closures of
+        the subsets of the attributes from each position onwards are
+        kept, so each closure is grown from the closure of a subset
+        with one attribute fewer instead of being computed again.
+        """
+        bits = []
+        while attrs:
+            bit = attrs & -attrs
+            bits.append(bit)
+            attrs ^= bit
+
+        # suffix_closures[i] is the closure of base and the attributes
+        # of the current subset from bits[i] onwards.
+        if closure is None:
+            closure = self.compute(base)
+        suffix_closures = [closure] * (len(bits) + 1)
+        mask = base
+        yield mask, closure
+
+        for step in range(1, 1 << len(bits)):
+            # The Gray code flips the attribute at the lowest set bit of
+            # the step, and only the suffixes up to it are affected.
+            flipped = (step & -step).bit_length() - 1
+            mask ^= bits[flipped]
+
+            for i in range(flipped, -1, -1):
+                closure = suffix_closures[i + 1]
+                if mask & bits[i]:
+                    closure = self.extend(closure, bits[i])
+                suffix_closures[i] = closure
+
+            yield mask, closure
+
+    def fill_lattice(self, base: int, num_attrs: int):
+        """
+        Returns the closures of base joined with every subset of the
+        first num_attrs attributes, indexed by the mask of the subset.
+
+        The closure of a subset is grown from the closure of the
+        subset without its last attribute, which is always
+        computed before it.
+        """
+        size = 1 << num_attrs
+        kernel = self.get_kernel()
+
+        if kernel is not None:
+            # Compute the closures of all subsets with a new attribute in
+            # one batch, from the closures of the subsets without it, and
+            # keep them as an array of ints rather than of NumPy scalars.
+            closures = np.zeros(size, dtype=np.uint64)
+            closures[0] = self.compute(base)
+
+            for i in range(num_attrs):
+                half, bit = 1 << i, np.uint64(1 << i)
+                seeds = closures[:half]
+                new_closures = seeds.copy()
+
+                # Only the subsets whose closure lacks the new attribute change.
+                lacks_bit = (seeds & bit) == np.uint64(0)
+                new_closures[lacks_bit] = kernel.closures(seeds[lacks_bit] | bit)
+                closures[half : 2 * half] = new_closures
+
+            return array("Q", closures.tobytes())
+
+        if max(self.num_bits, base.bit_length(), num_attrs) <= 64:
+            closures = array("Q", bytes(8 * size))
+        else:
+            closures = [0] * size
+
+        closures[0] = self.compute(base)
+        for mask in range(1, size):
+            bit = 1 << (mask.bit_length() - 1)
+            closure = closures[mask ^ bit]
+
+            # If the last attribute is already in the closure of the
+            # other attributes, adding it does not change the closure.
+            if closure & bit == 0:
+                closure = self.extend(closure, bit)
+
+            closures[mask] = closure
+
+        return closures
+
+
+# The closure engine of a worker process, shipped once per pool.
+_worker_engine = None
+
+
+def _init_worker(fd_masks: list) -> None:
+    global _worker_engine
+    _worker_engine = ClosureEngine(fd_masks)
+
+
+def _fill_lattice_chunk(base: int, num_attrs: int):
+    return _worker_engine.fill_lattice(base, num_attrs)
+
+
+def _walk_superkeys_chunk(attrs: int, base: int, full_mask: int) -> list:
+    return [mask for mask, closure in _worker_engine.walk(attrs, base) if closure == full_mask]
+
+
+# The FDSet being decomposed by a worker process, shipped once per pool.
+_worker_fd_set = None
+
+
+def _init_decomposition_worker(attributes: list, fds: list, is_traced: bool) -> None:
+    global _worker_fd_set
+    _worker_fd_set = FDSet(attributes, fds, trace=ListTraceSink() if is_traced else None)
+
+
+def _decompose_bcnf_chunk(fragment: int, is_serial: bool):
+    result = _worker_fd_set._decompose_bcnf_step(fragment, is_serial)
+    if _worker_fd_set.trace is None:
+        return result, []
+    return result, _worker_fd_set.trace.drain()
+
+
+class ClosureKernel:
+    """
+    A class used to compute the closures of a batch of masks at
+    once with NumPy, with the LHS and RHS of the FDs as uint64 masks.
+
+    Every step fires all the FDs applicable to each mask of the
+    batch, until no mask in the batch changes.
+    """
+
+    # The number of (mask, FDep) pairs to test in one step.
+    STEP_SIZE = 1 << 22
+
+    def __init__(self, fd_masks):
+        self.lhs = np.array([lhs for lhs, _ in fd_masks], dtype=np.uint64)
+        self.rhs = np.array([rhs for _, rhs in fd_masks], dtype=np.uint64)
+        self.batch_size = max(1, self.STEP_SIZE // max(1, len(fd_masks)))
+
+    def is_supported(num_bits: int) -> bool:
+        """
+        Checks if NumPy is installed and the masks fit in uint64.
+        """
+        return np is not None and num_bits <= 64
+
+    def closures(self, masks):
+        """
+        Returns a uint64 array of the closures of the masks.
+        """
+        closures = np.array(masks, dtype=np.uint64)
+        zero = np.uint64(0)
+
+        for start in range(0, len(closures), self.batch_size):
+            batch = closures[start : start + self.batch_size]
+
+            # Only the masks which changed in the last step are stepped again.
+            active = np.arange(len(batch))
+            while len(active) > 0:
+                masks = batch[active]
+                is_applicable = (self.lhs[None, :] & ~masks[:, None]) == zero
+                fired = np.bitwise_or.reduce(
+                    np.where(is_applicable, self.rhs[None, :], zero), axis=1
+                )
+                new_masks = masks | fired
+
+                has_changed = new_masks != masks
+                active = active[has_changed]
+                batch[active] = new_masks[has_changed]
+
+        return closures
+
+
+class ClosureLattice:
+    """
+    A class used to hold the closures of every subset of the
+    attributes of an FDSet, in an array indexed by the mask
+    of each subset, as filled by ClosureEngine.fill_lattice.
+    """
+
+    def __init__(self, fd_set):
+        self.encoder = fd_set._encode()
+        self.num_attrs = len(fd_set.attributes)
+        engine = fd_set._engine
+
+        if fd_set.workers <= 1 or self.num_attrs < fd_set.PARALLEL_MIN_ATTRS:
+            self.closures = engine.fill_lattice(0, self.num_attrs)
+        else:
+            self.closures = ClosureLattice.fill_in_pool(fd_set)
 
-    def is_trivial(self):
+        # Every closure in the lattice is computed once, and only the
+        # reads after the first one of each closure reuse it.
+        self.cache = fd_set._closure_cache
+        self.cache.count(misses=len(self.closures))
+        self.is_read = bytearray(len(self.closures))
+
+    def fill_in_pool(fd_set):
+        """
+        Returns the closures of every subset of the attributes of an
+        FDSet, filled in chunks across a pool of processes.
+        """
+        num_attrs = len(fd_set.attributes)
+        free_attrs, bases = AttrEncoder.split_chunks((1 << num_attrs) - 1, fd_set.workers)
+        num_free = free_attrs.bit_length()
+
+        with ProcessPoolExecutor(
+            max_workers=fd_set.workers,
+            initializer=_init_worker,
+            initargs=(fd_set._engine.fd_masks,),
+        ) as executor:
+            chunks = executor.map(_fill_lattice_chunk, bases, repeat(num_free))
+            closures = next(chunks)
+            for chunk in chunks:
+                closures += chunk
+
+        return closures
+
+    def __getitem__(self, mask: int) -> int:
+        if self.is_read[mask]:
+            self.cache.hits += 1
+        else:
+            self.is_read[mask] = 1
+        return self.closures[mask]
+
+    def __len__(self) -> int:
+        return len(self.closures)
+
+    def iter_masks(self):
         """
-        Checks if the FDep is trivial or not.
+        Yields the masks of all non-empty subsets of attributes,
+        ordered the same way AttrComparator orders them.
         """
-        return self.lhs == self.rhs or (self.rhs).issubset(self.lhs)
+        bits = [1 << i for i in range(self.num_attrs)]
+        for num_attr in range(1, self.num_attrs + 1):
+            for attrs in combinations(bits, num_attr):
+                yield sum(attrs)
 
 
 class AttributeClosure(FDep):
@@ -105,6 +603,8 @@ class AttributeClosure(FDep):
     Represented in the form of { attributes -> closure }
     """
 
+    __slots__ = ()
+
     def attributes(self):
         return self.lhs
 
@@ -120,6 +620,288 @@ class AttributeClosure(FDep):
 
         return self.lhs == other.lhs and self.rhs == other.rhs
 
+    __hash__ = FDep.__hash__
+
+
+class FDTable:
+    """
+    A class used to hold a list of FDs as two columns of LHS
+    and RHS masks, which are only turned into FDep objects
+    when they are needed, such as for printing.
+
+    If NumPy is installed, the columns are sorted, deduplicated,
+    filtered and compared as whole arrays.
+    """
+
+    def __init__(self, encoder: AttrEncoder, lhs=(), rhs=()):
+        self.encoder = encoder
+        typecode = "Q" if len(encoder.attrs) <= 64 else None
+        self.lhs = array(typecode, lhs) if typecode else list(lhs)
+        self.rhs = array(typecode, rhs) if typecode else list(rhs)
+
+    def from_fds(encoder: AttrEncoder, fds) -> "FDTable":
+        """
+        Returns a table of a list of FDs.
+        """
+        table = FDTable(encoder)
+        for fd in fds:
+            table.append(encoder.encode(fd.lhs), encoder.encode(fd.rhs))
+
+        return table
+
+    def __len__(self) -> int:
+        return len(self.lhs)
+
+    def __iter__(self):
+        return zip(self.lhs, self.rhs)
+
+    def __getitem__(self, i: int):
+        return self.lhs[i], self.rhs[i]
+
+    def append(self, lhs: int, rhs: int) -> None:
+        self.lhs.append(lhs)
+        self.rhs.append(rhs)
+
+    def take(self, indices) -> "FDTable":
+        """
+        Returns a new table of the rows at the given indices.
+        """
+        return FDTable(
+            self.encoder, [self.lhs[i] for i in indices], [self.rhs[i] for i in indices]
+        )
+
+    def to_fds(self) -> list:
+        """
+        Returns the rows of the table as FDep objects.
+        """
+        decode = self.encoder.decode
+        return [FDep(decode(lhs), decode(rhs)) for lhs, rhs in self]
+
+    def _columns(self):
+        """
+        Returns the columns as uint64 NumPy arrays, or None if
+        they cannot be handled by NumPy.
+        """
+        if np is None or not isinstance(self.lhs, array) or len(self) == 0:
+            return None
+
+        return np.frombuffer(self.lhs, dtype=np.uint64), np.frombuffer(
+            self.rhs, dtype=np.uint64
+        )
+
+    def _keys(self):
+        """
+        Returns one uint64 key per row which identifies the row,
+        or None if the masks do not fit in a single key.
+        """
+        columns = self._columns()
+        if columns is None or len(self.encoder.attrs) > 32:
+            return None
+
+        lhs, rhs = columns
+        return (lhs << np.uint64(32)) | rhs
+
+    def unique(self) -> "FDTable":
+        """
+        Returns a new table without repeated rows, keeping
+        the first occurrence of each row in order.
+        """
+        keys = self._keys()
+        if keys is not None:
+            _, first_indices = np.unique(keys, return_index=True)
+            return self.take(np.sort(first_indices).tolist())
+
+        seen = set()
+        indices = []
+        for i, row in enumerate(self):
+            if row not in seen:
+                seen.add(row)
+                indices.append(i)
+
+        return self.take(indices)
+
+    def recode(self, encoder: AttrEncoder) -> "FDTable":
+        """
+        Returns the same table with its masks encoded by another encoder.
+        """
+        if encoder.attrs[: len(self.encoder.attrs)] == self.encoder.attrs:
+            return FDTable(encoder, self.lhs, self.rhs)
+
+        to_list = self.encoder.to_list
+        table = FDTable(encoder)
+        for lhs, rhs in self:
+            table.append(encoder.encode(to_list(lhs)), encoder.encode(to_list(rhs)))
+
+        return table
+
+    def difference(self, other: "FDTable") -> "FDTable":
+        """
+        Returns a new table of the rows which are not in another table.
+        """
+        other = other.recode(self.encoder)
+        keys, other_keys = self._keys(), other._keys()
+        if keys is not None and other_keys is not None:
+            return self.take(np.flatnonzero(~np.isin(keys, other_keys)).tolist())
+
+        other_rows = set(other)
+        return self.take([i for i, row in enumerate(self) if row not in other_rows])
+
+    def sorted(self) -> "FDTable":
+        """
+        Returns a new table with its rows ordered the same way
+        as a sorted list of FDep objects.
+        """
+        columns = self._columns()
+        if columns is not None and self.encoder.is_ordered:
+            lhs, rhs = columns
+            lhs_count, lhs_rank = FDTable._rank(lhs, len(self.encoder.attrs))
+            rhs_count, rhs_rank = FDTable._rank(rhs, len(self.encoder.attrs))
+            return self.take(np.lexsort((rhs_rank, rhs_count, lhs_rank, lhs_count)).tolist())
+
+        sort_key = self.encoder.sort_key
+        return self.take(
+            sorted(range(len(self)), key=lambda i: (sort_key(self.lhs[i]), sort_key(self.rhs[i])))
+        )
+
+    def _rank(masks, num_bits: int):
+        """
+        Returns the number of attributes in each mask, and a rank
+        which orders masks with as many attributes by their sorted
+        lists of attributes.
+
+        Among sets of the same size, the set holding the smallest
+        attribute in which they differ comes first. Reversing the
+        bits of the complement turns that attribute into the most
+        significant differing bit, which is 0 for that set.
+        """
+        ranks = ~masks
+        for shift, pattern in (
+            (1, 0x5555555555555555),
+            (2, 0x3333333333333333),
+            (4, 0x0F0F0F0F0F0F0F0F),
+        ):
+            shift, pattern = np.uint64(shift), np.uint64(pattern)
+            ranks = ((ranks >> shift) & pattern) | ((ranks & pattern) << shift)
+
+        ranks = ranks.byteswap() >> np.uint64(64 - max(1, num_bits))
+        return FDTable._count_bits(masks), ranks
+
+    def _count_bits(masks):
+        """
+        Returns the number of attributes in each mask.
+        """
+        if hasattr(np, "bitwise_count"):
+            return np.bitwise_count(masks)
+
+        counts = np.zeros(len(masks), dtype=np.uint64)
+        for i in range(64):
+            counts += (masks >> np.uint64(i)) & np.uint64(1)
+
+        return counts
+
+
+class TraceSink:
+    """
+    A class used to receive the steps of the minimal cover and
+    decomposition algorithms, as an event name and its fields.
+
+    Tracing is off unless an FDSet is given a sink, and the steps
+    are not even built when it is off. This sink discards every
+    step, and the other sinks override emit to keep them.
+    """
+
+    def emit(self, event: str, fields: dict) -> None:
+        """
+        Receives one step, which this sink discards.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Releases whatever the sink holds, which this sink does not need to.
+        """
+        pass
+
+
+class JSONTraceSink(TraceSink):
+    """
+    A trace sink which writes every step as one line of JSON
+    to a single buffered file.
+    """
+
+    def __init__(self, filename: str, buffer_size: int = 1 << 16):
+        self.out = open(filename, "w", buffering=buffer_size)
+
+    def emit(self, event: str, fields: dict) -> None:
+        self.out.write(json.dumps({"event": event, **fields}) + "\n")
+
+    def close(self) -> None:
+        self.out.close()
+
+
+class ListTraceSink(TraceSink):
+    """
+    A trace sink which keeps every step in a list, such as to hand
+    the steps taken in a worker process back to the main one.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event: str, fields: dict) -> None:
+        self.events.append((event, fields))
+
+    def drain(self) -> list:
+        """
+        Returns the steps kept so far, and forgets them.
+        """
+        events, self.events = self.events, []
+        return events
+
+
+class FDStore:
+    """
+    A class used to hold the FDs of a database instance in the order
+    they were added, with the RHS of each LHS for looking them up directly.
+
+    Every FDep has a frozenset LHS whose hash is cached, so the
+    RHS are keyed by it instead of by a mask, which would change
+    whenever attributes are added to the database instance.
+    """
+
+    def __init__(self, fds=()):
+        self.fds = []
+        self.fd_set = set()
+
+        # The union of the RHS of the FDs sharing each LHS.
+        self.rhs_by_lhs = {}
+
+        for fd in fds:
+            self.add(fd)
+
+    def __len__(self) -> int:
+        return len(self.fds)
+
+    def __iter__(self):
+        return iter(self.fds)
+
+    def __contains__(self, fd) -> bool:
+        return fd in self.fd_set
+
+    def add(self, fd: FDep) -> bool:
+        """
+        Adds an FDep to the store, returning false if
+        the store already holds it.
+        """
+        if fd in self.fd_set:
+            return False
+
+        self.fds.append(fd)
+        self.fd_set.add(fd)
+        self.rhs_by_lhs[fd.lhs] = self.rhs_by_lhs.get(fd.lhs, frozenset()) | fd.rhs
+
+        return True
+
 
 class FDSet:
     """
@@ -127,15 +909,61 @@ class FDSet:
     and the functional dependencies in a database instance.
     """
 
-    def __init__(self, attributes: list = [], fds: list = []):
+    # The fewest attributes for which a command is split across
+    # processes, and the depth of the decomposition from which
+    # each subtree is decomposed serially by one process.
+    PARALLEL_MIN_ATTRS = 12
+    PARALLEL_MAX_DEPTH = 3
+
+    # The normal forms checked by classify, from the strongest down.
+    NORMAL_FORMS = ["BCNF", "3NF", "2NF"]
+
+    def __init__(
+        self,
+        attributes: list = [],
+        fds: list = [],
+        closure_cache_size=None,
+        workers: int = 1,
+        trace: TraceSink = None,
+    ):
         self.attributes = set(attributes)
-        self.fds = []
+        self._store = FDStore()
         self.bcnf_decomposition = []
         self._3nf_decomposition = []
 
+        # The number of processes to split the exponential commands across.
+        self.workers = workers
+
+        # Where the steps of the algorithms are traced to, if anywhere.
+        self.trace = trace
+
+        # Bitset encoding of the attributes and FDs, built on demand.
+        self._encoder = None
+        self._fd_masks = None
+        self._engine = None
+        self._attribute_classes = None
+        self._prime_mask = None
+        self._lattice = None
+        self._classification = None
+        self._closure_cache = ClosureCache(closure_cache_size)
+
+        # The iterators of the BCNF decompositions of each fragment,
+        # keyed by its mask.
+        self._bcnf_memo = {}
+        self._bcnf_memo_hits = 0
+        self._bcnf_memo_misses = 0
+
         for fd in fds:
             self.add_fd(fd)
 
+    @property
+    def fds(self) -> tuple:
+        """
+        Returns the FDs of the database instance in the order they were added,
+        which are only added to through add_fd.
+        """
+        return tuple(self._store.fds)
+
     def __str__(self):
         return f"R{sorted(self.attributes)}\nF{sorted(self.fds)}"
 
@@ -146,13 +974,36 @@ class FDSet:
         if not isinstance(other, FDSet):
             return False
 
-        for fd in other.fds:
-            clos = self.get_attribute_closure(fd.lhs)
-            if not (fd.rhs).issubset(clos.closure()):
+        return self.equivalent(other)
+
+    def implies(self, other) -> bool:
+        """
+        Checks if the FDs of the database instance imply every FDep
+        of other, which is either an FDSet or a list of FDs.
+        """
+        store = other._store if isinstance(other, FDSet) else FDStore(other)
+        encoder = self._encode()
+
+        # FDs sharing a LHS only need one closure between them.
+        for lhs, rhs in store.rhs_by_lhs.items():
+            if encoder.encode(rhs) & ~self._closure_mask(encoder.encode(lhs)) != 0:
                 return False
 
         return True
 
+    def equivalent(self, other) -> bool:
+        """
+        Checks if the FDs of the database instance and other, which is
+        either an FDSet or a list of FDs, imply each other.
+
+        The closures of the database instance are cached, so checking
+        many sets of FDs against the same FDSet only indexes it once.
+        """
+        if not isinstance(other, FDSet):
+            other = FDSet(self.attributes, other)
+
+        return self.implies(other) and other.implies(self)
+
     def issubset(self, other):
         """
         Checks if the FDs of this FDSet is a subset of
@@ -161,14 +1012,14 @@ class FDSet:
         if not isinstance(other, FDSet):
             return False
 
-        this_fds, other_fds = set(self.fds), set(other.fds)
-        return this_fds.issubset(other_fds)
+        return all(fd in other._store for fd in self._store)
 
     def add_attributes(self, attributes: list):
         """
         Appends attributes to the database instance.
         """
         self.attributes = self.attributes.union(set(attributes))
+        self._invalidate()
 
     def add_fd(self, fd: FDep) -> None:
         """
@@ -178,104 +1029,393 @@ class FDSet:
         if len(fd.lhs) == 0:
             return
 
-        fds_to_add = []
+        added = False
         for a in fd.rhs:
-            fds_to_add.append(FDep(fd.lhs, set(a)))
-
-        for fd in fds_to_add:
             # Prevent adding of duplicate FDs, when deemed necessary
-            if not fd in self.fds:
-                self.fds.append(fd)
+            if self._store.add(FDep(fd.lhs, a)):
+                added = True
+
+        if added:
+            self._invalidate()
+
+    def _invalidate(self):
+        """
+        Discards the state derived from the attributes and FDs,
+        so that it is rebuilt the next time it is needed.
+        """
+        self._encoder = None
+        self._fd_masks = None
+        self._engine = None
+        self._attribute_classes = None
+        self._prime_mask = None
+        self._lattice = None
+        self._classification = None
+        self._closure_cache.clear()
+        self._bcnf_memo = {}
+
+    def _encode(self) -> AttrEncoder:
+        """
+        Returns the attribute encoder of the database instance,
+        encoding the LHS and RHS of every FDep as masks.
+        """
+        if self._encoder is None:
+            encoder = AttrEncoder(self.attributes)
+            self._fd_masks = [
+                (encoder.encode(fd.lhs), encoder.encode(fd.rhs)) for fd in self._store
+            ]
+            self._engine = ClosureEngine(self._fd_masks)
+            self._encoder = encoder
+
+        return self._encoder
+
+    def _full_mask(self) -> int:
+        """
+        Returns the mask of all the attributes of the database instance.
+        """
+        return (1 << len(self.attributes)) - 1
+
+    def _get_attribute_classes(self) -> AttributeClasses:
+        """
+        Sorts the attributes of the database instance by the sides
+        of the FDs they appear on, as masks.
+
+        Attributes on no RHS (lhs_only and neither) are in every
+        candidate key, while attributes only on a RHS (rhs_only) are
+        in none, so only the attributes in both need to be searched.
+        """
+        if self._attribute_classes is None:
+            self._encode()
+            full_mask = self._full_mask()
+            lhs_attrs, rhs_attrs = 0, 0
+
+            for lhs, rhs in self._fd_masks:
+                # An FDep with attributes outside of the schema
+                # on the LHS can never fire.
+                if lhs & ~full_mask == 0:
+                    lhs_attrs |= lhs
+                    rhs_attrs |= rhs & full_mask
+
+            self._attribute_classes = AttributeClasses(
+                lhs_only=lhs_attrs & ~rhs_attrs,
+                rhs_only=rhs_attrs & ~lhs_attrs,
+                both=lhs_attrs & rhs_attrs,
+                neither=full_mask & ~(lhs_attrs | rhs_attrs),
+            )
+
+        return self._attribute_classes
+
+    def _get_lattice(self) -> ClosureLattice:
+        """
+        Returns the closures of all subsets of attributes,
+        which are computed once and shared by every command.
+        """
+        if self._lattice is None:
+            self._lattice = ClosureLattice(self)
+
+        return self._lattice
+
+    def _walk_closures(self, attrs: int, base: int = 0):
+        """
+        Yields the closures of the subsets of attrs, as in ClosureEngine.walk.
+        """
+        self._encode()
+
+        # The closure of base is looked up in the cache, and the
+        # closures of the other subsets are computed by the walk.
+        self._closure_cache.count(misses=(1 << bin(attrs).count("1")) - 1)
+        return self._engine.walk(attrs, base, self._closure_mask(base))
+
+    def _iter_subset_closures(self, attrs: int, base: int = 0):
+        """
+        Yields every subset of attrs joined with base, together with
+        its closure, from the lattice if it has been built, or else
+        from a Gray code walk.
+        """
+        if self._lattice is None or base | attrs >= len(self._lattice):
+            yield from self._walk_closures(attrs, base)
+            return
+
+        for core in AttrEncoder.submasks(attrs):
+            yield base | core, self._lattice[base | core]
+
+    def _iter_superkey_masks(self, attrs: int, base: int = 0):
+        """
+        Yields every subset of attrs joined with base which is a
+        superkey, splitting the walk across several workers if
+        there are enough subsets and no lattice to read them from.
+        """
+        full_mask = self._full_mask()
+        num_attrs = bin(attrs).count("1")
+        if (
+            self.workers <= 1
+            or num_attrs < self.PARALLEL_MIN_ATTRS
+            or self._lattice is not None
+        ):
+            for mask, closure in self._iter_subset_closures(attrs, base):
+                if closure == full_mask:
+                    yield mask
+            return
+
+        # Walk the free attributes of each chunk from its fixed ones.
+        free_attrs, bases = AttrEncoder.split_chunks(attrs, self.workers)
+        bases = [base | chunk for chunk in bases]
+
+        self._encode()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._engine.fd_masks,),
+        ) as executor:
+            for masks in executor.map(
+                _walk_superkeys_chunk, repeat(free_attrs), bases, repeat(full_mask)
+            ):
+                yield from masks
+
+    def _closure_mask(self, mask: int, closed=None) -> int:
+        """
+        Gets the attribute closure of a mask of attributes,
+        reusing the closure if it has been computed before.
+
+        If closed is the closure of a subset of the mask, a new
+        closure is grown from it instead of computed from scratch.
+        """
+        if self._lattice is not None and mask < len(self._lattice):
+            return self._lattice[mask]
+
+        closure = self._closure_cache.get(mask)
+        if closure is None:
+            if closed is None:
+                closure = self._compute_closure_mask(mask)
+            else:
+                closure = self._extend_closure(closed, mask)
+            self._closure_cache.put(mask, closure)
+
+        return closure
+
+    def _compute_closure_mask(self, mask: int) -> int:
+        """
+        Computes the attribute closure of a mask of attributes.
+        """
+        self._encode()
+        return self._engine.compute(mask)
+
+    def _extend_closure(self, closure: int, mask: int) -> int:
+        """
+        Returns the closure of a closed mask and more attributes, as in ClosureEngine.extend.
+        """
+        self._encode()
+        return self._engine.extend(closure, mask)
 
     def get_attribute_closure(self, attr) -> AttributeClosure:
         """
         Gets the attribute closure of a set of attributes.
         """
-        attr_copy = set(attr).copy()
-        fds_copy = self.fds.copy()
-        fds_left = set()
+        encoder = self._encode()
+        closure = self._closure_mask(encoder.encode(attr))
+        return AttributeClosure(attr, encoder.decode(closure))
 
-        while fds_left != fds_copy:  # Whilte an FDep has been deleted.
-            fds_left = fds_copy.copy()
-            for f in fds_copy:
-                if (f.lhs).issubset(attr_copy):
-                    attr_copy = attr_copy.union(f.rhs)
-                    fds_copy.remove(f)
-                    break
+    def get_closure_cache_info(self) -> CacheInfo:
+        """
+        Returns the hits, misses, size bound and current size
+        of the attribute closure cache.
 
-        return AttributeClosure(attr, attr_copy)
+        Closures computed in the lattice or in a walk of subsets are
+        counted as misses, and closures read again from the lattice
+        as hits, since the lattice answers them before the cache.
+        """
+        return self._closure_cache.info()
 
     def get_attribute_closures(self) -> list:
         """
         Gets the closure of all subsets of attributes.
         """
+        encoder = self._encode()
+        lattice = self._get_lattice()
+
+        # The closures are ordered for readaibility purposes.
         attr_closures = []
-        for num_attr in range(1, len(self.attributes) + 1):
-            for attrs in combinations(self.attributes, num_attr):
-                attrs_copy = set(attrs).copy()
-                attr_clos = self.get_attribute_closure(attrs_copy)
-                attr_closures.append(attr_clos)
+        for mask in lattice.iter_masks():
+            attr_closures.append(
+                AttributeClosure(encoder.decode(mask), encoder.decode(lattice[mask]))
+            )
 
-        # Sort the closures for readaibility purposes.
-        return sorted(attr_closures)
+        return attr_closures
 
     def get_essential_attr_closures(self) -> list:
         """
         Gets the closure of all subsets of attributes
         excluding super keys that are not candidate keys.
         """
+        encoder = self._encode()
+        lattice = self._get_lattice()
+        full_mask = self._full_mask()
+        classes = self._get_attribute_classes()
+
+        # The closures are ordered for readaibility purposes.
         attr_closures = []
-        all_attribute_closures = self.get_attribute_closures()
+        for mask in lattice.iter_masks():
+            closure = lattice[mask]
+            if closure == full_mask and not self._is_candidate_key_mask(mask, classes):
+                continue
+
+            attr_closures.append(
+                AttributeClosure(encoder.decode(mask), encoder.decode(closure))
+            )
+
+        return attr_closures
+
+    def _is_candidate_key_mask(self, mask: int, classes: AttributeClasses) -> bool:
+        """
+        Checks if a superkey is a candidate key, by only
+        removing the attributes which may not be in a key.
+        """
+        if mask & classes.rhs_only:
+            return False
 
-        superkeys = self.get_superkeys()
-        candidate_keys = self.get_candidate_keys()
+        full_mask = self._full_mask()
+        attrs_left = mask & classes.both
+        while attrs_left:
+            bit = attrs_left & -attrs_left
+            attrs_left ^= bit
 
-        for closure in all_attribute_closures:
-            attrs = sorted(closure.attributes().copy())
-            if not (attrs in superkeys and not attrs in candidate_keys):
-                attr_closures.append(closure)
+            if self._closure_mask(mask & ~bit) == full_mask:
+                return False
 
-        # Sort the closures for readaibility purposes.
-        return sorted(attr_closures)
+        return True
 
     def get_superkeys(self) -> list:
         """
         Gets all the superkeys of the database instance.
         """
-        superkeys = []
+        encoder = self._encode()
+        full_mask = self._full_mask()
+        if full_mask == 0:
+            return []
 
-        for num_attr in range(1, len(self.attributes) + 1):
-            for attrs in combinations(self.attributes, num_attr):
-                attrs_copy = set(attrs).copy()
+        # Every superkey holds the attributes on no RHS, and stays a
+        # superkey without its RHS-only attributes, so only the subsets
+        # of the attributes in both need their closures computed.
+        classes = self._get_attribute_classes()
+        required = classes.lhs_only | classes.neither
+        superkeys = []
 
-                # If the closure of the set of attributes is the same
-                # as the set of attributes in the database instance,
-                # this set of attributes must be a superkey.
-                if self.get_attribute_closure(attrs_copy).closure() == self.attributes:
-                    superkeys.append(sorted(attrs_copy))
+        for mask in self._iter_superkey_masks(classes.both, required):
+            for extra in AttrEncoder.submasks(classes.rhs_only):
+                superkeys.append(encoder.to_list(mask | extra))
 
         # Sort the superkeys for readaibility purposes.
         return sorted(superkeys)
 
+    def _minimize_superkey(self, mask: int) -> int:
+        """
+        Removes attributes from a superkey for as long as it
+        remains a superkey, returning a candidate key.
+        """
+        full_mask = self._full_mask()
+        classes = self._get_attribute_classes()
+
+        # Attributes on no RHS can never be removed from a superkey,
+        # and RHS-only attributes can always be removed.
+        mask &= ~classes.rhs_only
+        attrs_left = mask & classes.both
+
+        while attrs_left:
+            # Try the attributes from the last one down, so
+            # that earlier attributes tend to stay in the key.
+            bit = 1 << (attrs_left.bit_length() - 1)
+            attrs_left ^= bit
+
+            if self._closure_mask(mask & ~bit) == full_mask:
+                mask &= ~bit
+
+        return mask
+
+    def _iter_candidate_key_masks(self):
+        """
+        Yields the masks of all the candidate keys, using the
+        algorithm of Lucchesi and Osborn.
+
+        Starting from one candidate key, every key K and FDep X -> Y
+        gives the superkey X + (K - Y), which is minimized into a new
+        key unless it contains a key that has been found already.
+        """
+        self._encode()
+        full_mask = self._full_mask()
+        if full_mask == 0 or self._closure_mask(full_mask) != full_mask:
+            return
+
+        # FDs with attributes outside of the schema on the LHS
+        # can never contribute to a key.
+        fd_masks = [(lhs, rhs) for lhs, rhs in self._fd_masks if lhs & ~full_mask == 0]
+
+        keys = [self._minimize_superkey(full_mask)]
+        yield keys[0]
+
+        i = 0
+        while i < len(keys):
+            key = keys[i]
+            i += 1
+
+            for lhs, rhs in fd_masks:
+                superkey = lhs | (key & ~rhs)
+                if any(k & ~superkey == 0 for k in keys):
+                    continue
+
+                new_key = self._minimize_superkey(superkey)
+                keys.append(new_key)
+                yield new_key
+
+    def iter_candidate_keys(self):
+        """
+        Yields the candidate keys of the database instance one at
+        a time, without enumerating all of its superkeys.
+        """
+        encoder = self._encode()
+        for mask in self._iter_candidate_key_masks():
+            yield encoder.to_list(mask)
+
+    def find_one_key(self) -> list:
+        """
+        Gets one candidate key of the database instance, by removing
+        attributes from the set of all attributes for as long as it
+        remains a superkey.
+        """
+        encoder = self._encode()
+        return encoder.to_list(self._minimize_superkey(self._full_mask()))
+
     def get_candidate_keys(self) -> list:
         """
         Gets all the candidate keys of the database instance.
         """
-        superkeys = self.get_superkeys()
-        keys = []
+        return sorted(self.iter_candidate_keys())
+
+    def _get_prime_mask(self) -> int:
+        """
+        Returns the mask of all the prime attributes, computed
+        once and shared by every check that needs it.
+        """
+        if self._prime_mask is None:
+            full_mask = self._full_mask()
+            classes = self._get_attribute_classes()
+            keys = self._iter_candidate_key_masks()
 
-        for superkey in superkeys:
-            is_candidate_key = True
+            # Without any candidate key, no attribute is prime.
+            prime_mask = next(keys, 0)
 
-            for superkey_2 in superkeys:
-                if superkey != superkey_2 and set(superkey_2).issubset(set(superkey)):
-                    is_candidate_key = False
+            # Attributes on no RHS are in every key and RHS-only
+            # attributes are in none, so only the attributes in
+            # both are left to be settled by the other keys.
+            unknown = classes.both & ~prime_mask
+            for key in keys:
+                if unknown == 0:
                     break
 
-            if is_candidate_key:
-                keys.append(superkey)
+                prime_mask |= key
+                unknown &= ~key
 
-        return sorted(keys)
+            self._prime_mask = prime_mask & full_mask
+
+        return self._prime_mask
 
     def is_prime_attribute(self, attr: str) -> bool:
         """
@@ -283,47 +1423,59 @@ class FDSet:
         """
         assert len(attr) == 1
 
-        keys = self.get_candidate_keys()
-
-        for key in keys:
-            if attr in key:
-                return True
-
-        return False
+        encoder = self._encode()
+        return attr in encoder.bits and self._get_prime_mask() & encoder.bits[attr] != 0
 
     def get_prime_attributes(self) -> list:
         """
         Returns all the prime attributes of the
         database instance.
         """
-        prime_attributes = []
-        for attr in self.attributes:
-            if self.is_prime_attribute(attr):
-                prime_attributes.append(attr)
-
         # Sort the prime attributes for readaibility purposes.
-        return sorted(prime_attributes)
+        return self._encode().to_list(self._get_prime_mask())
 
     def get_fd_closure(self) -> list:
         """
         Returns Sigma+, also known as the FDep closure
         of the database instance.
         """
-        fd_closure = []
+        return list(self.iter_fd_closure())
+
+    def iter_fd_closure(self):
+        """
+        Yields Sigma+ one FDep at a time, in the same order as
+        get_fd_closure, without holding all of Sigma+ in memory.
+
+        The FDs are yielded in blocks sharing the same LHS, with
+        the LHS taken in order from the closure lattice.
+        """
+        encoder = self._encode()
+        lattice = self._get_lattice()
 
-        for num_attr in range(1, len(self.attributes) + 1):
-            for attrs in combinations(self.attributes, num_attr):
-                attr_closure = self.get_attribute_closure(set(attrs))
+        # The FDep closure is ordered for readaibility purposes.
+        for mask in lattice.iter_masks():
+            lhs = encoder.decode(mask)
 
-                for attr in attr_closure.closure():
-                    attr_set = set(attr)
+            # Only the attributes outside of the LHS give non-trivial FDs.
+            for attr in encoder.to_list(lattice[mask] & ~mask):
+                yield FDep(lhs, attr)
 
-                    # If the FDep is not trivial, then add it in.
-                    if not attr_set.issubset(set(attrs)):
-                        fd_closure.append(FDep(set(attrs), attr_set))
+    def _get_fd_closure_table(self) -> FDTable:
+        """
+        Returns Sigma+ as a table of masks, in the same
+        order as get_fd_closure.
+        """
+        lattice = self._get_lattice()
+        table = FDTable(self._encode())
 
-        # Sort the FDep closure for readaibility purposes.
-        return sorted(fd_closure)
+        for mask in lattice.iter_masks():
+            new_attrs = lattice[mask] & ~mask
+            while new_attrs:
+                bit = new_attrs & -new_attrs
+                table.append(mask, bit)
+                new_attrs ^= bit
+
+        return table
 
     def get_minimal_cover_from_fds(self):
         """
@@ -337,52 +1489,45 @@ class FDSet:
         Returns the minimal cover reachable from the set of
         fds provided as an argument.
         """
+        encoder = self._encode()
         if fd_set is None:
             # If no set of FDs are provided, take
             # Sigma+, the FDep closure of the database instance.
-            fd_set = self.get_fd_closure()
-
-        closures = self.get_attribute_closures()
+            fd_table = self._get_fd_closure_table()
+        else:
+            fd_table = FDTable.from_fds(encoder, fd_set)
 
         # Step 1: Simplify the LHS of all FDs
-        fd_set_1 = MinimalCoverUtils.simplify_lhs(fd_set, closures)
+        fd_set_1 = MinimalCoverUtils.simplify_lhs(fd_table, self._closure_mask)
 
         # Step 2: Remove FDs that can do not contribute to the attribute closure.
-        fd_set_2 = MinimalCoverUtils.remote_redundant_fds(fd_set_1, self.attributes)
-
-        ### BEGIN WRITE ###
-        with open('temp-{}.txt'.format(ceil(random() * 10000)), 'w') as out:
-            out.write(sys._getframe(1).f_code.co_name + "\n")
-            for fd in fd_set:
-                out.write(str(fd) + '\n')
-            out.write('\n')
-
-            out.write("Remove Redundant LHS\n")
-            for fd in set(fd_set).difference(set(fd_set_1)):
-                out.write(str(fd) + '\n')
-            out.write('\n')
-
-            out.write("Remove Redundant FDs\n")
-            for fd in set(fd_set_1).difference(set(fd_set_2)):
-                out.write(str(fd) + '\n')
-            out.write('\n')
-
-            out.write("Minimal Cover\n")
-            for fd in sorted(fd_set_2):
-                out.write(str(fd) + '\n')
-            out.write('\n')
-
-        ### END WRITE ###
+        fd_set_2 = MinimalCoverUtils.remote_redundant_fds(fd_set_1)
 
         # Sort the FDs for readaibility purposes.
-        return sorted(fd_set_2)
-
-    def get_all_minimal_covers_from_fds(self):
+        minimal_cover = fd_set_2.sorted().to_fds()
+        if self.trace is not None:
+            self.trace.emit(
+                "minimal_cover",
+                {
+                    "fds": [fd.to_result() for fd in fd_table.to_fds()],
+                    "redundant_lhs": [
+                        fd.to_result() for fd in fd_table.difference(fd_set_1).to_fds()
+                    ],
+                    "redundant_fds": [
+                        fd.to_result() for fd in fd_set_1.difference(fd_set_2).to_fds()
+                    ],
+                    "minimal_cover": [fd.to_result() for fd in minimal_cover],
+                },
+            )
+
+        return minimal_cover
+
+    def get_all_minimal_covers_from_fds(self, limit=None):
         """
         Returns all the minimal covers reachable from the set of
         fds of the minimal cover.
         """
-        return self.get_all_minimal_covers(self.fds)
+        return self.get_all_minimal_covers(self.fds, limit)
 
     def get_compact_fds(self, fd_set = None):
         """
@@ -410,123 +1555,287 @@ class FDSet:
         return compact_fds
     
 
-    def get_all_minimal_covers(self, fd_set=None):
+    def get_all_minimal_covers(self, fd_set=None, limit=None):
         """
         Returns all the minimal covers reachable from the set of
-        fds provided as an argument.
+        fds provided as an argument, or only the first limit of
+        them that are found.
+        """
+        fd_set_1, covers = self._iter_minimal_cover_rows(fd_set)
+        rows_list = list(islice(covers, limit))
+
+        # The covers are ordered by size, then by the order of their FDs.
+        rows_list.sort(key=lambda rows: (len(rows), rows))
+        return [[fd_set_1[i] for i in rows] for rows in rows_list]
+
+    def iter_all_minimal_covers(self, fd_set=None, limit=None):
         """
-        # Retrieve the fds from a sample minimal cover.
-        example_minimal_cover_fds = self.get_minimal_cover(fd_set)
+        Yields the minimal covers reachable from the set of fds
+        provided as an argument as they are found, stopping
+        after limit of them if a limit is given.
+        """
+        fd_set_1, covers = self._iter_minimal_cover_rows(fd_set)
+        for rows in islice(covers, limit):
+            yield [fd_set_1[i] for i in rows]
 
+    def _iter_minimal_cover_rows(self, fd_set=None):
+        """
+        Returns the FDs with a simplified LHS, together with a generator
+        of the minimal covers among them as tuples of indices.
+        """
+        encoder = self._encode()
         if fd_set is None:
             # If no set of FDs are provided, take
             # Sigma+, the FDep closure of the database instance.
-            fd_set = self.get_fd_closure()
-
-        attribute_closures = self.get_attribute_closures()
+            fd_table = self._get_fd_closure_table()
+        else:
+            fd_table = FDTable.from_fds(encoder, fd_set)
 
         # Step 1: Simplify the LHS of all FDs
-        fd_set_1 = MinimalCoverUtils.simplify_lhs(fd_set, attribute_closures)
+        fd_table_1 = MinimalCoverUtils.simplify_lhs(fd_table, self._closure_mask)
 
-        # Step 2: Permutate through all possible combinations of fds to
-        #         find possible minimal covers.
-        minimal_covers = []
+        # Step 2: Search the subsets of the FDs which are equivalent to them
+        #         and have no redundant FDep.
+        return fd_table_1.to_fds(), MinimalCoverUtils.iter_irredundant_covers(fd_table_1)
 
-        for num_fds in range(1, len(fd_set_1) + 1):
-            for possible_minimal_cover_fds in combinations(fd_set_1, num_fds):
-                possible_minimal_cover_fds = list(possible_minimal_cover_fds)
+    def classify(self) -> Classification:
+        """
+        Returns the highest normal form the database instance is in,
+        together with its candidate keys, its prime attributes and,
+        for each normal form, the FDs which violate it.
 
-                # Calculate the sample minimal cover and possible minimal covers.
-                example_minimal_cover = FDSet(
-                    fds=example_minimal_cover_fds, attributes=self.attributes
-                )
-                possible_cover = FDSet(
-                    fds=possible_minimal_cover_fds, attributes=self.attributes
-                )
+        The classification is computed once and shared by the
+        is_in_bcnf, is_in_3nf and is_in_2nf checks.
+        """
+        if self._classification is None:
+            self._classification = self._compute_classification()
 
-                # If the set of FDs from both minimal covers are equivalent.
-                if possible_cover == example_minimal_cover:
-                    can_add_possible_cover = True
+        return self._classification
+
+    def _compute_classification(self) -> Classification:
+        """
+        Computes the classification returned by classify.
+        """
+        encoder = self._encode()
+        full_mask = self._full_mask()
 
-                    for cover in minimal_covers:
-                        # If there already exists a minimal cover which has a subset
-                        # of FDs of the possible minimal cover, DO NOT add the
-                        # possible minimal cover.
-                        if cover.issubset(possible_cover):
-                            can_add_possible_cover = False
-                            break
-                    if can_add_possible_cover:
-                        minimal_covers.append(possible_cover)
+        key_masks = list(self._iter_candidate_key_masks())
+        prime_mask = 0
+        for key in key_masks:
+            prime_mask |= key
+        self._prime_mask = prime_mask
 
-        return [cover.fds for cover in minimal_covers]
+        violations = {normal_form: [] for normal_form in self.NORMAL_FORMS}
+        if len(self.attributes) >= 2:
+            for fd, (lhs, rhs) in zip(self._store, self._fd_masks):
+                is_superkey = (
+                    lhs & ~full_mask == 0 and self._closure_mask(lhs) & full_mask == full_mask
+                )
+                if rhs & ~lhs == 0 or is_superkey:
+                    continue
+
+                # A nontrivial FDep from a set of attributes which is not a
+                # superkey violates BCNF, and 3NF if its RHS is not prime.
+                violations["BCNF"].append(fd)
+                if rhs & ~lhs & ~prime_mask != 0:
+                    violations["3NF"].append(fd)
+
+            # A non-prime attribute which depends on part of a candidate
+            # key violates 2NF, and if any part of a key determines one,
+            # so does the key with one attribute left out.
+            partial_lhs = set()
+            for key in key_masks:
+                attrs_left = key
+                while attrs_left:
+                    bit = attrs_left & -attrs_left
+                    attrs_left ^= bit
+
+                    lhs = key & ~bit
+                    if lhs == 0 or lhs in partial_lhs:
+                        continue
+
+                    non_prime = self._closure_mask(lhs) & full_mask & ~prime_mask
+                    if non_prime != 0:
+                        partial_lhs.add(lhs)
+                        violations["2NF"].append(
+                            FDep(encoder.decode(lhs), encoder.decode(non_prime))
+                        )
+
+        normal_form = "1NF"
+        for candidate in reversed(self.NORMAL_FORMS):
+            if len(violations[candidate]) > 0:
+                break
+            normal_form = candidate
+
+        return Classification(
+            normal_form=normal_form,
+            candidate_keys=sorted(encoder.to_list(key) for key in key_masks),
+            prime_attributes=encoder.to_list(prime_mask),
+            violations=violations,
+        )
 
     def is_in_bcnf(self):
         """
         Returns true if the database instance is in BCNF
         """
-        if len(self.attributes) < 2:
-            return True
-
-        superkeys = self.get_superkeys()
-        for fd in self.fds:
-            if not fd.is_trivial() and not sorted(fd.lhs) in superkeys: 
-                return False 
-
-        return True 
+        return len(self.classify().violations["BCNF"]) == 0
 
     def is_in_3nf(self):
         """
         Returns true if the database instance is in 3NF
         """
-        if self.is_in_bcnf():
-            return True
-
-        superkeys = self.get_superkeys()
-        prime_attributes = self.get_prime_attributes()
-        for fd in self.fds:
-            if not fd.is_trivial() and not sorted(fd.lhs) in superkeys: 
-                for attribute in sorted(fd.rhs):
-                    if attribute not in prime_attributes:
-                        return False
-
-        return True 
+        return len(self.classify().violations["3NF"]) == 0
 
     def is_in_2nf(self):
         """
         Returns true if the database instance is in 2NF
         """
-        if self.is_in_3nf():
-            return True
+        return len(self.classify().violations["2NF"]) == 0
+
+    def init_child_FD_set(self, new_attrs):
+        """
+        Initialized a child FD Set given a set of 
+        new_attrs and a minimal cover of the fds which
+        can be implied in the child FD Set.
+        """
+        new_fds = self.project_fds(new_attrs)
+
+        return FDSet(sorted(new_attrs), new_fds, workers=self.workers, trace=self.trace)
+
+    def project_fds(self, attrs) -> list:
+        """
+        Returns a minimal cover of the projection of Sigma+
+        onto a subset of the attributes.
 
-        superkeys = self.get_superkeys()
-        prime_attributes = self.get_prime_attributes()
-        for fd in self.fds:
-            if not fd.is_trivial(): 
-                has_all_prime_attributes = True
-                for attribute in sorted(fd.rhs):
-                    if attribute not in prime_attributes:
-                        return False
+        Only the subsets of the given attributes are visited, and
+        their closures come from the closures of the database instance,
+        so they are shared by every fragment projected from it.
+        """
+        encoder = self._encode()
+        child_mask = encoder.encode(attrs)
 
-                if not has_all_prime_attributes:
-                    for superkey in superkeys: 
-                        if sorted(fd.lhs) < superkey:
-                            return False 
+        fd_table = FDTable(encoder)
+        for mask, attr_bits, implied in self._iter_fragment_closures(child_mask):
+            # Only keep the attributes which no smaller subset implies,
+            # so that the LHS of every FDep is already simplified.
+            new_attrs = implied & ~mask
+            for bit in attr_bits:
+                if not new_attrs:
+                    break
+                new_attrs &= ~self._closure_mask(mask ^ bit)
 
-        return True 
+            while new_attrs:
+                bit = new_attrs & -new_attrs
+                fd_table.append(mask, bit)
+                new_attrs ^= bit
 
-    def init_child_FD_set(self, new_attrs):
+        fd_table = MinimalCoverUtils.remote_redundant_fds(fd_table)
+
+        # Sort the FDs for readaibility purposes.
+        return fd_table.sorted().to_fds()
+
+    def _iter_fragment_closures(self, fragment: int, max_attrs=None):
         """
-        Initialized a child FD Set given a set of 
-        new_attrs and some fds which can be implied
-        in the child FD Set.
+        Yields the non-empty subsets of a fragment of the attributes
+        by increasing size, with the bits of each subset and its
+        closure within the fragment, up to max_attrs attributes.
+
+        Every FDep from a proper superset of a superkey of the fragment
+        is implied by an FDep from the superkey, so those are skipped.
         """
-        new_fds = []
+        bits = []
+        mask = fragment
+        while mask:
+            bit = mask & -mask
+            bits.append(bit)
+            mask ^= bit
 
-        for fd in self.get_fd_closure():
-            if fd.lhs <= new_attrs and fd.rhs <= new_attrs:
-                new_fds.append(fd)
+        if max_attrs is None:
+            max_attrs = len(bits)
 
-        return FDSet(sorted(new_attrs), new_fds)
+        superkeys = []
+        for num_attrs in range(1, max_attrs + 1):
+            for attr_bits in combinations(bits, num_attrs):
+                mask = sum(attr_bits)
+                if any(key & ~mask == 0 for key in superkeys):
+                    continue
+
+                # Grow the closure from the closure of the subset
+                # without the last attribute, visited before it.
+                closed = self._closure_mask(mask ^ attr_bits[-1])
+                implied = self._closure_mask(mask, closed) & fragment
+                if implied == fragment:
+                    superkeys.append(mask)
+
+                yield mask, attr_bits, implied
+
+    def _find_bcnf_violation(self, fragment: int):
+        """
+        Returns the mask of a set of attributes of a fragment whose
+        closure within the fragment holds more than itself but not
+        the whole fragment, or None if the fragment is in BCNF.
+        """
+        self._encode()
+
+        # The whole schema is split on the first FDep which violates BCNF,
+        # and every fragment on the first violation in sorted order.
+        if fragment == self._full_mask():
+            for lhs, rhs in self._fd_masks:
+                if lhs & ~fragment != 0 or rhs & ~lhs == 0:
+                    continue
+
+                # The RHS may lie outside of the schema, so the FDep only
+                # violates BCNF if its closure adds to it within the fragment.
+                implied = self._closure_mask(lhs) & fragment
+                if implied != lhs and implied != fragment:
+                    return lhs
+
+        # A witness leaves at least one attribute out of its
+        # closure, and its closure adds at least one attribute.
+        num_attrs = bin(fragment).count("1")
+        for mask, _, implied in self._iter_fragment_closures(fragment, num_attrs - 2):
+            if implied != mask and implied != fragment:
+                return mask
+
+        return None
+
+    def _decompose_bcnf(self, fragment: int) -> list:
+        """
+        Returns the masks of the fragments a fragment of the
+        attributes is split into by the decomposition algorithm,
+        checking each fragment against the FDs of the database
+        instance instead of projecting the FDs onto it.
+        """
+        split = self._split_bcnf(fragment)
+        if split is None:
+            return [fragment]
+
+        r1, r2 = split
+        return self._decompose_bcnf(r1) + self._decompose_bcnf(r2)
+
+    def _split_bcnf(self, fragment: int):
+        """
+        Returns the masks of the two fragments a fragment is split
+        into on its first violation of BCNF, or None if it is in BCNF.
+        """
+        violation = self._find_bcnf_violation(fragment)
+        if violation is None:
+            return None
+
+        r1 = self._closure_mask(violation) & fragment
+        r2 = (fragment & ~r1) | violation
+        if self.trace is not None:
+            encoder = self._encode()
+            self.trace.emit(
+                "bcnf_split",
+                {
+                    "fragment": encoder.to_list(fragment),
+                    "violation": encoder.to_list(violation),
+                    "fragments": [encoder.to_list(r1), encoder.to_list(r2)],
+                },
+            )
+
+        return r1, r2
 
     def decomposition_algorithm(self):
         """
@@ -540,22 +1849,189 @@ class FDSet:
         if self.is_in_bcnf():
             return [self]
 
-        superkeys = self.get_superkeys()
+        if self.workers > 1 and len(self.attributes) >= self.PARALLEL_MIN_ATTRS:
+            self.bcnf_decomposition = self._decompose_bcnf_in_pool()
+            return self.bcnf_decomposition
 
-        violating_fd = None 
-        for fd in self.fds:
-            if not fd.is_trivial() and not sorted(fd.lhs) in superkeys: 
-                violating_fd = fd
-                break 
+        # The FDs are only projected onto the final fragments.
+        encoder = self._encode()
+        self.bcnf_decomposition = [
+            self.init_child_FD_set(encoder.decode(fragment))
+            for fragment in self._decompose_bcnf(self._full_mask())
+        ]
+        return self.bcnf_decomposition
 
-        R1 = self.get_attribute_closure(violating_fd.lhs).closure()
-        R2 = (self.attributes.difference(R1)).union(violating_fd.lhs)
+    def _decompose_bcnf_step(self, fragment: int, is_serial: bool):
+        """
+        Returns the two fragments a fragment is split into, or a list
+        of the final fragments with their projected FDs. If is_serial
+        is true, the fragment is decomposed all the way down.
+        """
+        encoder = self._encode()
+        if is_serial:
+            fragments = self._decompose_bcnf(fragment)
+        else:
+            split = self._split_bcnf(fragment)
+            if split is not None:
+                return split
+
+            fragments = [fragment]
+
+        return [
+            (fragment, self.project_fds(encoder.decode(fragment))) for fragment in fragments
+        ]
+
+    def _decompose_bcnf_in_pool(self) -> list:
+        """
+        Returns the decomposition into BCNF, splitting the fragments of
+        each step and projecting the final fragments across a pool of
+        processes, so sibling subtrees are decomposed at the same time.
+        """
+        encoder = self._encode()
+
+        # The result of each node of the decomposition tree, either the
+        # nodes of its two fragments or its final fragments.
+        results = {}
+        num_nodes = 1
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_decomposition_worker,
+            initargs=(sorted(self.attributes), self.fds, self.trace is not None),
+        ) as executor:
+            pending = {
+                executor.submit(_decompose_bcnf_chunk, self._full_mask(), False): (0, 0)
+            }
+            while len(pending) > 0:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, depth = pending.pop(future)
+                    result, events = future.result()
+                    for event, fields in events:
+                        self.trace.emit(event, fields)
+                    if isinstance(result, list):
+                        results[node] = result
+                        continue
+
+                    children = (num_nodes, num_nodes + 1)
+                    num_nodes += 2
+                    results[node] = children
+                    for child, fragment in zip(children, result):
+                        is_serial = depth + 1 >= self.PARALLEL_MAX_DEPTH
+                        future = executor.submit(_decompose_bcnf_chunk, fragment, is_serial)
+                        pending[future] = (child, depth + 1)
+
+        # Read the final fragments off the tree from left to right.
+        decomposition = []
+        nodes = [0]
+        while len(nodes) > 0:
+            result = results[nodes.pop()]
+            if isinstance(result, list):
+                for fragment, fds in result:
+                    decomposition.append(
+                        FDSet(
+                            encoder.to_list(fragment), fds, workers=self.workers, trace=self.trace
+                        )
+                    )
+            else:
+                nodes.extend(reversed(result))
 
-        FD1 = self.init_child_FD_set(R1)
-        FD2 = self.init_child_FD_set(R2)
+        return decomposition
 
-        self.bcnf_decomposition = FD1.decomposition_algorithm() + FD2.decomposition_algorithm()
-        return self.bcnf_decomposition
+    def iter_bcnf_decompositions(self, limit=None):
+        """
+        Yields every distinct decomposition into BCNF which the
+        decomposition algorithm can reach by splitting on any
+        violation at each step, as lists of FDSets, stopping after
+        limit of them if a limit is given.
+        """
+        encoder = self._encode()
+        full_mask = self._full_mask()
+
+        # A fragment shared by several decompositions is projected once.
+        children = {}
+        for fragments in islice(self._iter_bcnf_fragment_sets(full_mask), limit):
+            if fragments == {full_mask}:
+                yield [self]
+                continue
+
+            decomposition = []
+            for fragment in sorted(fragments, key=encoder.sort_key):
+                if fragment not in children:
+                    children[fragment] = self.init_child_FD_set(encoder.decode(fragment))
+                decomposition.append(children[fragment])
+
+            yield decomposition
+
+    def get_bcnf_decompositions(self, limit=None) -> list:
+        """
+        Returns every distinct decomposition into BCNF which the
+        decomposition algorithm can reach, or only the first limit
+        of them that are found.
+        """
+        return list(self.iter_bcnf_decompositions(limit))
+
+    def get_bcnf_memo_info(self) -> CacheInfo:
+        """
+        Returns the hits, misses, size bound and current size of
+        the memo of the BCNF decompositions of each fragment.
+        """
+        return CacheInfo(
+            self._bcnf_memo_hits, self._bcnf_memo_misses, None, len(self._bcnf_memo)
+        )
+
+    def _get_bcnf_splits(self, fragment: int) -> list:
+        """
+        Returns the distinct ways the decomposition algorithm can
+        split a fragment, as pairs of masks, from every set of
+        attributes which violates BCNF in the fragment.
+        """
+        splits = {}
+        num_attrs = bin(fragment).count("1")
+        for mask, _, implied in self._iter_fragment_closures(fragment, num_attrs - 2):
+            if implied != mask and implied != fragment:
+                splits[(implied, (fragment & ~implied) | mask)] = None
+
+        return list(splits)
+
+    def _get_bcnf_fragment_sets(self, fragment: int) -> MemoizedIterator:
+        """
+        Returns the BCNF decompositions of a fragment as sets of
+        fragment masks, which are memoized since the same fragments
+        recur across the choices of violation.
+
+        They are only enumerated as far as they are read, so taking
+        the first few decompositions does not enumerate every one
+        of each fragment.
+        """
+        fragment_sets = self._bcnf_memo.get(fragment)
+        if fragment_sets is None:
+            self._bcnf_memo_misses += 1
+            fragment_sets = MemoizedIterator(self._iter_bcnf_fragment_sets(fragment))
+            self._bcnf_memo[fragment] = fragment_sets
+        else:
+            self._bcnf_memo_hits += 1
+
+        return fragment_sets
+
+    def _iter_bcnf_fragment_sets(self, fragment: int):
+        """
+        Yields the distinct BCNF decompositions of a fragment
+        as sets of fragment masks.
+        """
+        splits = self._get_bcnf_splits(fragment)
+        if len(splits) == 0:
+            yield frozenset([fragment])
+            return
+
+        # Different choices of violation often lead to the same fragments.
+        seen = set()
+        for r1, r2 in splits:
+            for fragments_1 in self._get_bcnf_fragment_sets(r1):
+                for fragments_2 in self._get_bcnf_fragment_sets(r2):
+                    fragments = fragments_1 | fragments_2
+                    if fragments not in seen:
+                        seen.add(fragments)
+                        yield fragments
 
     def is_bcnf_decomposition_dependency_preserving(self):
         if self.is_in_bcnf():
@@ -564,23 +2040,43 @@ class FDSet:
         if len(self.bcnf_decomposition) == 0:
             return False 
 
-        derived_fds = []
-        for fd_set in self.bcnf_decomposition:
-            derived_fds += fd_set.fds
+        return self.is_dependency_preserving(self.bcnf_decomposition)
 
-        derived_fd_set = FDSet(sorted(self.attributes), derived_fds)
+    def is_dependency_preserving(self, fragments) -> bool:
+        """
+        Checks if a decomposition of the database instance preserves
+        its FDs. Each fragment is either an FDSet or a set of attributes.
 
-        derived_fd_closure = derived_fd_set.get_fd_closure()
-        original_fd_closure = self.get_fd_closure()
-        for fd_clos in derived_fd_closure:
-            if not fd_clos in original_fd_closure:
-                return False 
+        Each LHS is grown with the closure of its attributes in one
+        fragment at a time, kept to that fragment, until it stops
+        growing. An FDep is preserved exactly when its RHS is reached,
+        so Sigma+ is never built.
+        """
+        encoder = self._encode()
+        fragment_masks = []
+        for fragment in fragments:
+            if isinstance(fragment, FDSet):
+                fragment = fragment.attributes
+            fragment_masks.append(encoder.encode(fragment))
 
-        for fd_clos in original_fd_closure:
-            if not fd_clos in derived_fd_closure:
-                return False 
+        # FDs sharing a LHS only need to be grown once between them.
+        for lhs, rhs in self._store.rhs_by_lhs.items():
+            rhs_mask = encoder.encode(rhs)
+            attrs = encoder.encode(lhs)
 
-        return True  
+            has_grown = True
+            while has_grown and rhs_mask & ~attrs != 0:
+                has_grown = False
+                for fragment in fragment_masks:
+                    new_attrs = self._closure_mask(attrs & fragment) & fragment & ~attrs
+                    if new_attrs:
+                        attrs |= new_attrs
+                        has_grown = True
+
+            if rhs_mask & ~attrs != 0:
+                return False
+
+        return True
 
     def synthesis_algorithm(self):
         """
@@ -597,17 +2093,18 @@ class FDSet:
         compact_minimal_cover = self.get_compact_fds(minimal_cover)
 
         relation_set = [(fd.lhs).union(fd.rhs) for fd in compact_minimal_cover]
-        candidate_keys = [set(key) for key in self.get_candidate_keys()]
-        
+
+        # A relation holds a candidate key exactly when it is a superkey.
+        encoder = self._encode()
+        full_mask = self._full_mask()
         has_candidate_key = False 
-        for key in candidate_keys:
-            for relation in relation_set:
-                if key <= relation:
-                    has_candidate_key = True 
-                    break 
+        for relation in relation_set:
+            if self._closure_mask(encoder.encode(relation)) & full_mask == full_mask:
+                has_candidate_key = True 
+                break 
 
         if not has_candidate_key:
-            relation_set.append(candidate_keys[0])
+            relation_set.append(set(self.find_one_key()))
 
         FD_set_list = []
         for relation in relation_set:
@@ -625,6 +2122,15 @@ class FDSet:
             if can_add_fd_set:
                 synthesis_result.append(fd_set)
 
+        if self.trace is not None:
+            self.trace.emit(
+                "3nf_synthesis",
+                {
+                    "relations": [sorted(relation) for relation in relation_set],
+                    "added_key": not has_candidate_key,
+                    "fragments": [sorted(fd_set.attributes) for fd_set in synthesis_result],
+                },
+            )
 
         self._3nf_decomposition = synthesis_result
         return self._3nf_decomposition
@@ -654,59 +2160,111 @@ class MinimalCoverUtils:
     minimal covers.
     """
 
-    def simplify_lhs(fd_set, attribute_closures):
+    def simplify_lhs(fd_table: FDTable, closure) -> FDTable:
         """
-        Returns a new list of fd closures where
+        Returns a new table of fd closures where
         the LHS is simplified.
+
+        Each attribute of the LHS is dropped in turn, from the last
+        to the first, if the closure of the remaining attributes
+        still holds the RHS, so only one closure is computed per
+        attribute instead of one per subset of the LHS.
         """
-        fd_set_1 = []
-        for fd in fd_set:
-            has_added = False
-            for closure in attribute_closures:
+        fd_table_1 = FDTable(fd_table.encoder)
+        for lhs, rhs in fd_table:
+            new_lhs = lhs
 
-                if (closure.attributes()).issubset(fd.lhs) and (
-                    (fd.rhs).issubset(closure.closure()) or fd.rhs == closure.closure()
-                ):
+            for bit in AttrEncoder.bits_descending(lhs):
+                attrs = new_lhs & ~bit
+                if rhs & ~closure(attrs) == 0:
                     # If the LHS of the FDep can be simplified, we simplify it.
-                    has_added = True
-                    new_fd = FDep(closure.attributes(), fd.rhs)
-                    if not new_fd in fd_set_1:
-                        fd_set_1.append(new_fd)
-                    break
+                    new_lhs = attrs
 
-            if not has_added and not fd in fd_set_1:
-                fd_set_1.append(fd)
+            fd_table_1.append(new_lhs, rhs)
 
-        return fd_set_1
+        return fd_table_1.unique()
 
-    def remote_redundant_fds(fd_set, attributes: set):
+    def remote_redundant_fds(fd_table: FDTable) -> FDTable:
         """
-        Returns a new list of fd closures which are not
+        Returns a new table of fd closures which are not
         redundant or trivial.
-        """
-        fd_set_1 = []
-        while fd_set_1 != fd_set:  # While an FDep has been deleted.
-            fd_set_1 = fd_set.copy()
-
-            for fd in fd_set:
-                fd_set_temp = fd_set.copy()
-                fd_set_temp.remove(fd)
-
-                # Calculate the closures attribute closure of the attributes of the
-                # LHS of the FDep with and without the remove FDep.
-                original_attribute_closure = FDSet(
-                    fds=fd_set, attributes=attributes
-                ).get_attribute_closure(fd.lhs)
-                new_attribute_closure = FDSet(
-                    fds=fd_set_temp, attributes=attributes
-                ).get_attribute_closure(fd.lhs)
-
-                # If the attribute closures are requivalent, this suggests
-                # that the FDep is reundant. Hence, we can remove it.
-                if original_attribute_closure == new_attribute_closure:
-                    fd_set = fd_set_temp.copy()
-                    break
 
-        # Return the set of FDs if there is no more reundant FDep
-        # that is being removed.
-        return fd_set_1
+        Removing an FDep can only shrink the closures of the others,
+        so an FDep which is kept never becomes redundant later on,
+        and a single pass over the FDs is enough.
+        """
+        engine = ClosureEngine(list(fd_table))
+        rows = []
+        for i, (lhs, rhs) in enumerate(fd_table):
+            # If the attribute closure of the LHS of the FDep without
+            # the FDep already holds its RHS, this suggests
+            # that the FDep is reundant. Hence, we can remove it.
+            engine.disable(i)
+            if rhs & ~engine.compute(lhs) != 0:
+                engine.enable(i)
+                rows.append(i)
+
+        return fd_table.take(rows)
+
+    def iter_irredundant_covers(fd_table: FDTable):
+        """
+        Yields every subset of the FDs of a table which is equivalent
+        to the whole table and has no redundant FDep, as a tuple of
+        indices in ascending order.
+
+        The FDs are decided in order. An FDep which is not implied by
+        the FDs that may still be kept must be kept, so the search
+        only branches on the redundant ones, trying to remove each of
+        them before keeping it. A branch is abandoned as soon as an
+        FDep kept by choice is implied by the other FDs already kept,
+        since adding more FDs can never make it necessary again.
+        """
+        # The FDs which may still be kept, and the FDs decided to be kept.
+        engine = ClosureEngine(list(fd_table))
+        kept_engine = ClosureEngine(list(fd_table))
+        for i in range(len(fd_table)):
+            kept_engine.disable(i)
+
+        # The FDs with a choice, as [index, is_kept] in the order decided.
+        branches = []
+        kept = []
+        i = 0
+        is_dead = False
+        while True:
+            while i < len(fd_table) and not is_dead:
+                if engine.is_redundant(i):
+                    engine.disable(i)
+                    branches.append([i, False])
+                else:
+                    kept_engine.enable(i)
+                    kept.append(i)
+                    is_dead = MinimalCoverUtils.has_redundant_choice(kept_engine, branches)
+                i += 1
+
+            if not is_dead:
+                yield tuple(kept)
+
+            # Keep the last removed FDep instead, and decide
+            # the FDs after it again.
+            while len(branches) > 0 and branches[-1][1]:
+                branches.pop()
+            if len(branches) == 0:
+                return
+
+            branches[-1][1] = True
+            last = branches[-1][0]
+            while len(kept) > 0 and kept[-1] > last:
+                kept_engine.disable(kept.pop())
+
+            engine.enable(last)
+            kept_engine.enable(last)
+            kept.append(last)
+            is_dead = MinimalCoverUtils.has_redundant_choice(kept_engine, branches)
+            i = last + 1
+
+    def has_redundant_choice(kept_engine: ClosureEngine, branches: list) -> bool:
+        """
+        Checks if any FDep kept by choice is implied
+        by the other FDs which are kept.
+        """
+        return any(is_kept and kept_engine.is_redundant(j) for j, is_kept in branches)
@@ -1,16 +1,39 @@
+import os
 import sys
-from fds import FDep, FDSet
+from fds import FDep, FDSet, JSONTraceSink
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.options import get_jobs, pop_option
 
 class FDUtils:
-    def __init__(self, fd_filename: str, command_filename: str, output_filename: str):
-        self.f = FDSet()
+    # Commands whose results are written out as they are generated.
+    STREAMING_COMMANDS = {"get_fd_closure": "iter_fd_closure"}
+
+    def __init__(
+        self,
+        fd_filename: str,
+        command_filename: str,
+        output_filename: str,
+        jobs: int = 1,
+        trace_filename: str = None,
+    ):
+        self.f = FDSet(workers=jobs)
         self.fd_filename = fd_filename
         self.command_filename = command_filename
         self.output_filename = output_filename
+        self.trace_filename = trace_filename
 
     def init(self):
-        self.populate_fds()
-        self.process_commands()
+        if self.trace_filename is not None:
+            self.f.trace = JSONTraceSink(self.trace_filename)
+
+        try:
+            self.populate_fds()
+            self.process_commands()
+        finally:
+            if self.f.trace is not None:
+                self.f.trace.close()
 
     def populate_fds(self):
         has_processed_attributes = False
@@ -22,19 +45,19 @@ class FDUtils:
                 self.add_fd(line.strip())
 
     def process_commands(self):
-        results = []
-        for line in open(self.command_filename, "r"):
-            command = line.strip()
-            results.append((command, getattr(self.f, command)()))
-
         with open(self.output_filename, "w") as out:
             out.write(str(self.f) + "\n\n")
 
-            for command, result in results:
+            # Write out the result of each command before running the next,
+            # so that only one result is held in memory at a time.
+            for line in open(self.command_filename, "r"):
+                command = line.strip()
+                method = self.STREAMING_COMMANDS.get(command, command)
+                result = getattr(self.f, method)()
+
                 out.write(command + "\n")
-                if isinstance(result, list):
-                    for r in result:
-                        out.write(str(r) + "\n")
+                if isinstance(result, list) or method != command:
+                    out.writelines(str(r) + "\n" for r in result)
                 else:
                     out.write(str(result) + "\n")
 
@@ -61,12 +84,20 @@ class FDUtils:
 
 
 def main():
-    if len(sys.argv) != 4:
-        print("Usage: python main.py <fd_file> <commands_file> <output_file>")
+    args = sys.argv[1:]
+    try:
+        jobs = get_jobs(args)
+        trace_filename = pop_option(args, "--trace")
+    except (IndexError, ValueError):
+        args = []
+
+    if len(args) != 3:
+        print("Usage: python main.py [--jobs N] [--trace FILE] <fd_file> <commands_file> <output_file>")
         return
 
-    utils = FDUtils(sys.argv[1], sys.argv[2], sys.argv[3])
+    utils = FDUtils(args[0], args[1], args[2], jobs, trace_filename)
     utils.init()
 
 
-main()
+if __name__ == "__main__":
+    main()